@@ -13,15 +13,31 @@ Key Changes:
 """
 import argparse
 import boto3
+import json
 import os
 import re
 import shutil
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta, UTC
+from itertools import chain
+
+try:
+    # Optional (pip install "boto3[crt]"): native multipart GETs outside the GIL
+    import awscrt  # noqa: F401
+    PREFERRED_TRANSFER_CLIENT = "crt"
+except ImportError:
+    PREFERRED_TRANSFER_CLIENT = "auto"
 
 # ---------------------------------------------------------------------------
 # CONSTANTS / CONFIG
 # ---------------------------------------------------------------------------
 BUCKET_NAME = "noaa-gfs-bdp-pds"
+# The NOAA open-data bucket lives in us-east-1 and has no Transfer
+# Acceleration, so talk to the regional endpoint directly.
+S3_REGION = "us-east-1"
 S3_BASE_PATH = "gfs"
 RESOLUTION = "0p25"
 
@@ -30,10 +46,19 @@ FILE_NAME_PATTERNS = [
     r"gfs\.t\d{2}z\.pgrb2",
     # add more patterns as needed
 ]
+# One compiled matcher for all patterns, e.g. gfs.tXXz.pgrb2.0p25.fHHH
+# group(1) => pattern, group(2) => forecast hour
+FILE_NAME_REGEX = re.compile(
+    r"(" + "|".join(FILE_NAME_PATTERNS) + r")\." + RESOLUTION + r"\.f(\d{3})"
+)
+# Forecast hour in a local filename, e.g. ".f027"
+FHR_REGEX = re.compile(r"\.f(\d{3})")
 
 #LOCAL_BASE_PATH = "/Volumes/ModelBackup/HyphenForecaster/gfs_slim"
 LOCAL_BASE_PATH = os.getenv("GRIB_FILES_PATH", "/Users/guernica0131/Sites/foreshadow-api/grib")
 MAX_DAYS = 5
+# Coverage map persisted between runs: {date: {hour: [fhr, ...]}}
+INDEX_FILE = os.path.join(LOCAL_BASE_PATH, ".index.json")
 
 # These will be used *per hour* depending on whether it's 00 or not:
 #  - 00 => 0..384
@@ -41,8 +66,48 @@ MAX_DAYS = 5
 FULL_RANGE = list(range(0, 385))   # up to f384
 SHORT_RANGE = list(range(0, 24))   # up to f023
 STEP_RANGE = list(range(123, 387, 3))   # up to f023
-# Boto3 S3 client
-s3 = boto3.client("s3")
+# Set views of the ranges above for membership/coverage checks
+SHORT_RANGE_SET = frozenset(SHORT_RANGE)
+STEP_RANGE_SET = frozenset(STEP_RANGE)
+# Sub-prefixes under gfs.YYYYMMDD/HH/ that are listed in parallel
+S3_SUB_PREFIXES = ["atmos/", "wave/"]
+# Deterministic keys (relative to gfs.YYYYMMDD/HH/) for FILE_NAME_PATTERNS,
+# used to skip the LIST step entirely when the layout is confirmed.
+S3_KEY_TEMPLATES = [
+    "wave/gridded/gfswave.t{hour}z.global.{resolution}.f{fhr}.grib2",
+    "atmos/gfs.t{hour}z.pgrb2.{resolution}.f{fhr}",
+]
+# Forecast hours are hourly up to f120 and 3-hourly after that
+HOURLY_FHR_LIMIT = 120
+# (run prefix, template) pairs confirmed complete by a HEAD during this run
+CONFIRMED_KEY_TEMPLATES: dict[tuple[str, str], bool] = {}
+LIST_WORKERS = 16
+DOWNLOAD_WORKERS = 32
+DELETE_WORKERS = 8
+# Boto3 S3 client (thread-safe, shared by all listing/download workers).
+# A single keep-alive pool avoids a TLS handshake per request.
+s3 = boto3.client(
+    "s3",
+    region_name=S3_REGION,
+    config=Config(
+        max_pool_connections=64,
+        retries={"mode": "adaptive", "max_attempts": 5},
+        tcp_keepalive=True,
+        signature_version="s3v4",
+        s3={"use_accelerate_endpoint": False, "us_east_1_regional_endpoint": "regional"}
+    )
+)
+# One transfer manager for the whole run: large GRIB files are fetched as
+# parallel 8 MB ranged GETs, by the CRT client when awscrt is installed or
+# by the classic thread-pool manager otherwise.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+    preferred_transfer_client=PREFERRED_TRANSFER_CLIENT
+)
+transfer_manager = create_transfer_manager(s3, TRANSFER_CONFIG)
 
 # ---------------------------------------------------------------------------
 # HELPER FUNCTIONS
@@ -51,24 +116,64 @@ def listFileHour(value: int) -> str:
     """Convert integer hour into zero-padded string: 6 -> '006'."""
     return f"{value:03d}"
 
-def list_s3_files(bucket: str, prefix: str):
+def _list_s3_prefix(bucket: str, prefix: str) -> list[str]:
+    """
+    Paginate a single prefix and return all of its keys.
+    """
+    paginator = s3.get_paginator("list_objects_v2")
+    pages = paginator.paginate(Bucket=bucket, Prefix=prefix, PaginationConfig={"PageSize": 1000})
+    # Project straight to the keys; empty pages yield None
+    return [key for key in pages.search("Contents[].Key") if key is not None]
+
+def list_s3_files(bucket: str, prefix: str | list[str]):
     """
     Recursively list all S3 keys under a prefix.
     For example, prefix='gfs.20250101/00/' might yield keys in wave/, atmos/, etc.
+    When a list of sub-prefixes is given (e.g. ['gfs.20250101/00/atmos/',
+    'gfs.20250101/00/wave/']), each one is paginated on its own thread.
     """
-    files = []
-    paginator = s3.get_paginator("list_objects_v2")
-    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-        if "Contents" in page:
-            files.extend([obj["Key"] for obj in page["Contents"]])
-    return files
+    if isinstance(prefix, str):
+        return _list_s3_prefix(bucket, prefix)
+    if not prefix:
+        return []
+    with ThreadPoolExecutor(max_workers=min(LIST_WORKERS, len(prefix))) as executor:
+        listings = executor.map(lambda p: _list_s3_prefix(bucket, p), prefix)
+        return list(chain.from_iterable(listings))
+
+def s3_key_exists(bucket: str, key: str) -> bool:
+    """
+    HEAD a single key. Returns False on 404, re-raises any other error.
+    """
+    try:
+        s3.head_object(Bucket=bucket, Key=key)
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
 
 def download_s3_file(bucket: str, key: str, destination: str):
     """
     Download a single file from S3 to 'destination'.
+    The destination folder is expected to exist already.
     """
-    os.makedirs(os.path.dirname(destination), exist_ok=True)
-    s3.download_file(bucket, key, destination)
+    transfer_manager.download(bucket, key, destination).result()
+
+def parse_fhr(fname: str):
+    """
+    Return the forecast hour from a '.fXXX' filename, or None.
+    Tries a plain str.find first and only falls back to the regex when the
+    first '.f' isn't followed by three digits.
+    """
+    idx = fname.find(".f")
+    if idx != -1:
+        digits = fname[idx + 2:idx + 5]
+        if len(digits) == 3 and digits.isdigit():
+            return int(digits)
+    match = FHR_REGEX.search(fname)
+    if match:
+        return int(match.group(1))
+    return None
 
 def find_local_fvalues(folder_path: str):
     """
@@ -79,20 +184,101 @@ def find_local_fvalues(folder_path: str):
     if not os.path.isdir(folder_path):
         return fvalues
 
-    for fname in os.listdir(folder_path):
-        full_path = os.path.join(folder_path, fname)
-        if not os.path.isfile(full_path):
-            continue
-        match = re.search(r"\.f(\d{3})", fname)
-        if match:
-            fhr = int(match.group(1))
-            fvalues.add(fhr)
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            fhr = parse_fhr(entry.name)
+            if fhr is not None:
+                fvalues.add(fhr)
     return fvalues
 
+def load_download_index() -> dict:
+    """
+    Load the coverage map written by the previous run, or {} if there is none.
+    """
+    try:
+        with open(INDEX_FILE) as f:
+            raw = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {
+        date_str: {hour_str: set(fvals) for hour_str, fvals in hours.items()}
+        for date_str, hours in raw.items()
+    }
+
+def save_download_index(downloaded_map: dict):
+    """
+    Atomically persist the coverage map, dropping dates no longer on disk.
+    """
+    os.makedirs(LOCAL_BASE_PATH, exist_ok=True)
+    serializable = {
+        date_str: {hour_str: sorted(fvals) for hour_str, fvals in hours.items()}
+        for date_str, hours in downloaded_map.items()
+        if os.path.isdir(os.path.join(LOCAL_BASE_PATH, date_str))
+    }
+    tmp_path = INDEX_FILE + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(serializable, f)
+    os.replace(tmp_path, INDEX_FILE)
+
+def known_fvalues(local_dir: str, date_str: str, hour_str: str, downloaded_map: dict):
+    """
+    Forecast hours already on disk for <date>/<hour>.
+    Trusts the persisted index when the folder hasn't changed since it was
+    written; otherwise falls back to scanning the folder.
+    """
+    indexed = downloaded_map.get(date_str, {}).get(hour_str)
+    if indexed is not None and os.path.isdir(local_dir):
+        try:
+            if os.path.getmtime(INDEX_FILE) >= os.path.getmtime(local_dir):
+                return set(indexed)
+        except OSError:
+            pass
+    return find_local_fvalues(local_dir)
+
 
 # ---------------------------------------------------------------------------
 # DOWNLOAD LOGIC
 # ---------------------------------------------------------------------------
+def published_fhrs(required_hours: list[int]) -> list[int]:
+    """
+    The forecast hours NOAA actually publishes among required_hours.
+    """
+    return [hr for hr in required_hours if hr <= HOURLY_FHR_LIMIT or hr % 3 == 0]
+
+def _try_head_direct(prefix: str, hour_str: str, required_hours: list[int]):
+    """
+    Build the deterministic S3 keys for every (template, forecast hour) pair
+    of a run whose files are all published. Each template is confirmed once
+    per run prefix with a HEAD on its last published hour; runs upload in
+    forecast-hour order, so that file existing means the earlier ones do too.
+    Returns None if any template is missing (run absent or still uploading)
+    or a probe fails, so the caller falls back to listing.
+    """
+    fhrs = published_fhrs(required_hours)
+    if not fhrs:
+        return []
+    for template in S3_KEY_TEMPLATES:
+        if (prefix, template) in CONFIRMED_KEY_TEMPLATES:
+            continue
+        probe = prefix + template.format(
+            hour=hour_str, resolution=RESOLUTION, fhr=listFileHour(fhrs[-1])
+        )
+        try:
+            if not s3_key_exists(BUCKET_NAME, probe):
+                return None
+        except Exception as e:
+            print(f"HEAD {probe} failed, listing instead: {e}")
+            return None
+        CONFIRMED_KEY_TEMPLATES[(prefix, template)] = True
+
+    return [
+        (prefix + template.format(hour=hour_str, resolution=RESOLUTION, fhr=listFileHour(hr_val)), hr_val)
+        for template in S3_KEY_TEMPLATES
+        for hr_val in fhrs
+    ]
+
 def download_sparse_files(
     local_dir: str,
     prefix: str,
@@ -102,7 +288,8 @@ def download_sparse_files(
     downloaded_map: dict
 ) -> bool:
     """
-    1) Recursively list all S3 keys under 'prefix'.
+    1) Build the deterministic keys (HEAD-confirmed) or, failing that,
+       recursively list all S3 keys under 'prefix'.
     2) For each object, check if it matches FILE_NAME_PATTERNS + forecast hour.
     3) Place all matching files in local_dir = <date>/<hour> (no subfolders).
     4) Update coverage in downloaded_map, skip existing files.
@@ -112,45 +299,53 @@ def download_sparse_files(
     downloaded_any = False
 
     try:
-        s3_files = list_s3_files(BUCKET_NAME, prefix)
-        if not s3_files:
-            print(f"No files found under {prefix}")
-            return False
+        # Fast path: deterministic keys, no LIST round-trips
+        matched_keys = _try_head_direct(prefix, hour_str, required_hours)
+        if matched_keys is None:
+            s3_files = list_s3_files(BUCKET_NAME, [prefix + sub for sub in S3_SUB_PREFIXES])
+            if not s3_files:
+                print(f"No files found under {prefix}")
+                return False
+
+            # Single pass: one compiled search per key, then a set lookup
+            required_set = frozenset(required_hours)
+            matched_keys = []
+            for s3_key in s3_files:
+                match = FILE_NAME_REGEX.search(s3_key)
+                if not match:
+                    continue
+                hr_val = int(match.group(2))
+                if hr_val in required_set:
+                    matched_keys.append((s3_key, hr_val))
 
-        existing_fvals = find_local_fvalues(local_dir)
+        existing_fvals = known_fvalues(local_dir, date_str, hour_str, downloaded_map)
         newly_fetched_fvals = set()
-
-        matched_keys = []
-        for s3_key in s3_files:
-            # Check each forecast hour that we actually care about
-            for hr_val in required_hours:
-                hr_str = listFileHour(hr_val)
-                for pattern in FILE_NAME_PATTERNS:
-                    # e.g. gfs.tXXz.pgrb2.0p25.fHHH
-                    regex = rf"{pattern}\.{RESOLUTION}\.f{hr_str}"
-                    if re.search(regex, s3_key):
-                        matched_keys.append((s3_key, hr_val))
-                        break
-                else:
-                    continue
-                break  # matched at least one pattern for this hour, no need to keep scanning
         matched_keys = sorted(set(matched_keys), key=lambda x: x[0])
-        for obj_key, hr_val in matched_keys:
-            filename_only = os.path.basename(obj_key)
-            local_path = os.path.join(local_dir, filename_only)
+        os.makedirs(local_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            future_map = {}
+            for obj_key, hr_val in matched_keys:
+                filename_only = os.path.basename(obj_key)
+                local_path = os.path.join(local_dir, filename_only)
+
+                # If we already have this forecast hour or file exists, skip
+                if hr_val in existing_fvals or os.path.exists(local_path):
+                    downloaded_any = True
+                    continue
 
-            # If we already have this forecast hour or file exists, skip
-            if hr_val in existing_fvals or os.path.exists(local_path):
-                downloaded_any = True
-                continue
+                print(f"Downloading {obj_key} -> {local_path}")
+                fut = executor.submit(download_s3_file, BUCKET_NAME, obj_key, local_path)
+                future_map[fut] = (obj_key, hr_val)
 
-            print(f"Downloading {obj_key} -> {local_path}")
-            try:
-                download_s3_file(BUCKET_NAME, obj_key, local_path)
-                newly_fetched_fvals.add(hr_val)
-                downloaded_any = True
-            except Exception as e:
-                print(f"Failed to download {obj_key}: {e}")
+            # Results are drained on this thread only, so no lock is needed
+            for fut in as_completed(future_map):
+                obj_key, hr_val = future_map[fut]
+                try:
+                    fut.result()
+                    newly_fetched_fvals.add(hr_val)
+                    downloaded_any = True
+                except Exception as e:
+                    print(f"Failed to download {obj_key}: {e}")
 
         # Update coverage in downloaded_map
         if date_str not in downloaded_map:
@@ -205,14 +400,11 @@ def is_00_coverage_complete(downloaded_map: dict, date_str: str) -> bool:
     # Get forecast hours actually downloaded
     fvals = downloaded_map[date_str]["00"]
     # Check if all first 24 hours are present
-    first_120 = set(SHORT_RANGE)
-    if not first_120.issubset(fvals):
+    if not SHORT_RANGE_SET.issubset(fvals):
         return False
 
-    upto_384 = set(STEP_RANGE)
     # Check if the last required hour (384) is present
-    print(upto_384)
-    if not upto_384.issubset(fvals):
+    if not STEP_RANGE_SET.issubset(fvals):
         return False
 
     return True
@@ -224,7 +416,37 @@ def is_00_coverage_complete(downloaded_map: dict, date_str: str) -> bool:
 # ---------------------------------------------------------------------------
 # CLEANUP LOGIC
 # ---------------------------------------------------------------------------
-def prune_files_to_24h(hour_folder: str):
+def unlink_quietly(path: str):
+    """
+    os.unlink that logs instead of raising, for use on the delete pool.
+    """
+    try:
+        os.unlink(path)
+    except OSError as e:
+        print(f"Failed to remove {path}: {e}")
+
+def remove_tree(root: str, executor: ThreadPoolExecutor):
+    """
+    Parallel equivalent of shutil.rmtree(root, ignore_errors=True).
+    Files are unlinked on the pool; directories are removed bottom-up once
+    every file has gone.
+    """
+    dirs = []
+    futures = []
+    for dirpath, _, filenames in os.walk(root, topdown=False):
+        futures.extend(executor.submit(unlink_quietly, os.path.join(dirpath, f)) for f in filenames)
+        dirs.append(dirpath)
+    wait(futures)
+    for dirpath in dirs:
+        try:
+            os.rmdir(dirpath)
+        except OSError:
+            pass
+    # Anything the walker could not handle (e.g. symlinked dirs)
+    if os.path.lexists(root):
+        shutil.rmtree(root, ignore_errors=True)
+
+def prune_files_to_24h(hour_folder: str, executor: ThreadPoolExecutor):
     """
     In <date>/<hour> folder, remove forecast files beyond f023.
     E.g. gfswave.t00z.global.0p25.f027.grib2 => remove
@@ -232,24 +454,24 @@ def prune_files_to_24h(hour_folder: str):
     if not os.path.isdir(hour_folder):
         return
 
-    for fname in os.listdir(hour_folder):
-        full_path = os.path.join(hour_folder, fname)
-        if not os.path.isfile(full_path):
-            continue
+    with os.scandir(hour_folder) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
 
-        match = re.search(r"\.f(\d{3})", fname)
-        if match:
-            fhr = int(match.group(1))
-            if fhr > 23:
-                print(f"Removing {full_path} because forecast hour f{fhr:03d} > 023")
-                os.remove(full_path)
+            fhr = parse_fhr(entry.name)
+            if fhr is not None and fhr > 23:
+                print(f"Removing {entry.path} because forecast hour f{fhr:03d} > 023")
+                executor.submit(unlink_quietly, entry.path)
 
-def cleanup_old_data(latest_date_str: str):
+def cleanup_old_data(latest_date_str: str, downloaded_map: dict):
     """
     1) Delete date folders older than MAX_DAYS.
     2) For days < latest_date_str, keep only '00' with f000–f023 (prune above f023).
     3) Remove other hour folders entirely for older days.
     (No partial-coverage logic for the current day is needed now.)
+    downloaded_map is pruned the same way, so the saved index never lists
+    files that were deleted here.
     """
 
     latest_date_dt = datetime.strptime(latest_date_str, "%Y%m%d")
@@ -258,39 +480,48 @@ def cleanup_old_data(latest_date_str: str):
     if not os.path.exists(LOCAL_BASE_PATH):
         return
 
-    for folder_name in os.listdir(LOCAL_BASE_PATH):
-        date_path = os.path.join(LOCAL_BASE_PATH, folder_name)
-        if not os.path.isdir(date_path):
-            continue
+    # os.unlink releases the GIL, so deletes scale across threads
+    with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+        for folder_name in os.listdir(LOCAL_BASE_PATH):
+            date_path = os.path.join(LOCAL_BASE_PATH, folder_name)
+            if not os.path.isdir(date_path):
+                continue
 
-        try:
-            folder_date = datetime.strptime(folder_name, "%Y%m%d")
-        except ValueError:
-            continue
+            try:
+                folder_date = datetime.strptime(folder_name, "%Y%m%d")
+            except ValueError:
+                continue
 
-        # 1) Remove older than cutoff
-        if folder_date < cutoff_date:
-            print(f"Deleting old folder: {date_path}")
-            shutil.rmtree(date_path, ignore_errors=True)
-            continue
+            # 1) Remove older than cutoff
+            if folder_date < cutoff_date:
+                print(f"Deleting old folder: {date_path}")
+                remove_tree(date_path, executor)
+                downloaded_map.pop(folder_name, None)
+                continue
 
-        # 2) If < latest_date, keep only hour=00 with f000–f023
-        if folder_date < latest_date_dt:
-            print(f"Pruning older day: {date_path} => keep only 00 with f000–f023")
-            for hour_sub in os.listdir(date_path):
-                hour_path = os.path.join(date_path, hour_sub)
-                if not os.path.isdir(hour_path):
-                    continue
-                if hour_sub != "00":
-                    # remove hour folders other than '00'
-                    print(f"Removing hour folder: {hour_path}")
-                    shutil.rmtree(hour_path, ignore_errors=True)
-                else:
-                    # keep folder=00 but prune beyond f023
-                    prune_files_to_24h(hour_path)
-        else:
-            # Current day: do nothing. We no longer do partial coverage cleanup here.
-            print(f"Skipping cleanup for current day: {date_path}")
+            # 2) If < latest_date, keep only hour=00 with f000–f023
+            if folder_date < latest_date_dt:
+                print(f"Pruning older day: {date_path} => keep only 00 with f000–f023")
+                indexed_hours = downloaded_map.get(folder_name, {})
+                for hour_sub in list(indexed_hours):
+                    if hour_sub != "00":
+                        del indexed_hours[hour_sub]
+                    else:
+                        indexed_hours[hour_sub] = {fhr for fhr in indexed_hours[hour_sub] if fhr <= 23}
+                for hour_sub in os.listdir(date_path):
+                    hour_path = os.path.join(date_path, hour_sub)
+                    if not os.path.isdir(hour_path):
+                        continue
+                    if hour_sub != "00":
+                        # remove hour folders other than '00'
+                        print(f"Removing hour folder: {hour_path}")
+                        remove_tree(hour_path, executor)
+                    else:
+                        # keep folder=00 but prune beyond f023
+                        prune_files_to_24h(hour_path, executor)
+            else:
+                # Current day: do nothing. We no longer do partial coverage cleanup here.
+                print(f"Skipping cleanup for current day: {date_path}")
 
 # ---------------------------------------------------------------------------
 # MAIN
@@ -316,19 +547,23 @@ if __name__ == "__main__":
     # Parse the arguments
     args = parser.parse_args()
 
-    downloaded_files_map = {}
+    downloaded_files_map = load_download_index()
     # 1) Fetch today's data
     target_date = datetime.now(UTC) + timedelta(days=args.date_offset)  # Default: Today
     today_str = target_date.strftime("%Y%m%d")
-    pulled_new_data = fetch_sparse_data(downloaded_files_map, today_str)
+    try:
+        pulled_new_data = fetch_sparse_data(downloaded_files_map, today_str)
+    finally:
+        transfer_manager.shutdown()
     # 2) Only clean up if:
     #    - we downloaded something new today
     #    - and the 00 coverage is complete up to f384
     print(args.no_cleanup, pulled_new_data)
     if not args.no_cleanup:
         if pulled_new_data and is_00_coverage_complete(downloaded_files_map, today_str):
-            cleanup_old_data(today_str)
+            cleanup_old_data(today_str, downloaded_files_map)
         else:
             print("No complete 00 run found or no new data. Skipping cleanup.")
 
+    save_download_index(downloaded_files_map)
     print("Finished download and pruning process.")
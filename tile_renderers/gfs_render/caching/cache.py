@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 CACHE_TTL = 3600
 
@@ -14,3 +14,20 @@ class ICacheBackend:
 
     def delete(self, key: str):
         raise NotImplementedError
+
+    def mget(self, keys: Iterable[str]) -> List[Optional[Any]]:
+        return [self.get(key) for key in keys]
+
+    def mset(self, mapping: Dict[str, Any], expire: int = 0):
+        for key, value in mapping.items():
+            self.set(key, value, expire)
+
+    def update(self, key: str, fn: Callable[[Optional[Any]], Any], expire: int = 0) -> Any:
+        """
+        Replace key's value with fn(current value or None) and return it.
+        This default is a plain read-modify-write; backends that can make it
+        atomic override it.
+        """
+        value = fn(self.get(key))
+        self.set(key, value, expire)
+        return value
@@ -1,56 +1,72 @@
+import math
 import threading
 import time
-from datetime import datetime
-from .cache import ICacheBackend, CACHE_TTL
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+from .cache import ICacheBackend
 class LocalStorage(ICacheBackend):
-    def __init__(self):
-        self.data = {}
-        self.data_time = {}
-        self._lock = threading.Lock()  # for thread-safety
-        self._stop_event = threading.Event()
-        # Start the cleaner thread as a daemon
-        self._cleaner_thread = threading.Thread(target=self._cleanup_thread, daemon=True)
-        self._cleaner_thread.start()
+    """
+    In-process cache keyed by string.
+    Entries are stored as key -> (value, expires_at) in LRU order, where
+    expires_at is a time.monotonic() deadline (math.inf when expire == 0).
+    Expired entries are evicted lazily from the front on set (and individually
+    on get) instead of by a background cleaner thread.
+    """
+    def __init__(self, max_entries: Optional[int] = None):
+        self.data: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+        self.max_entries = max_entries
+        self._lock = threading.RLock()  # for thread-safety
 
     def set(self, key, value, expire: int = 0):
+        now = time.monotonic()
+        expires_at = now + expire if expire > 0 else math.inf
         with self._lock:
-            self.data[key] = value
-            if expire > 0:
-                self.data_time[key] = datetime.now()
+            self.data[key] = (value, expires_at)
+            self.data.move_to_end(key)
+            self._evict(now)
 
     def get(self, key):
-        with self._lock:
-            if key in self.data:
-                if key in self.data_time:
-                    # Check if the cached entry has expired
-                    if (datetime.now() - self.data_time[key]).total_seconds() > CACHE_TTL:
-                        self.delete(key)
-                        return None
-                return self.data.get(key)
+        # Hot path is lock-free: a single atomic dict lookup and one
+        # monotonic comparison. Only expiry and the LRU bump touch the lock.
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() > expires_at:
+            with self._lock:
+                if self.data.get(key) is entry:
+                    del self.data[key]
             return None
+        # Recency is best-effort: skip the bump rather than wait on a writer.
+        if self._lock.acquire(blocking=False):
+            try:
+                if key in self.data:
+                    self.data.move_to_end(key)
+            finally:
+                self._lock.release()
+        return value
 
     def delete(self, key: str):
         with self._lock:
-            if key in self.data:
-                del self.data[key]
-            if key in self.data_time:
-                del self.data_time[key]
+            self.data.pop(key, None)
 
-    def _cleanup_thread(self):
-        while not self._stop_event.is_set():
-            time.sleep(CACHE_TTL)  # Sleep for the TTL duration
-            now = datetime.now()
-            keys_to_delete = []
-            with self._lock:
-                # Identify keys that have expired
-                for key, timestamp in list(self.data_time.items()):
-                    if (now - timestamp).total_seconds() > CACHE_TTL:
-                        keys_to_delete.append(key)
-                # Delete the expired keys
-                for key in keys_to_delete:
-                    self.delete(key)
+    def update(self, key: str, fn: Callable[[Optional[Any]], Any], expire: int = 0) -> Any:
+        # The lock is reentrant, so get/set inside it keep their own bookkeeping.
+        with self._lock:
+            value = fn(self.get(key))
+            self.set(key, value, expire)
+            return value
 
-    def stop(self):
-        """Stop the cleaner thread gracefully."""
-        self._stop_event.set()
-        self._cleaner_thread.join()
+    def _evict(self, now: float):
+        """
+        Pop expired entries from the least-recently-used end until the head
+        is still live, then trim down to max_entries. Caller holds the lock.
+        """
+        while self.data:
+            head_key, (_, expires_at) = next(iter(self.data.items()))
+            if now <= expires_at:
+                break
+            del self.data[head_key]
+        if self.max_entries is not None:
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
@@ -1,20 +1,73 @@
+import logging
+import msgpack
 import redis
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 from .cache import ICacheBackend
+logger = logging.getLogger(__name__)
+
 class RedisCacheBackend(ICacheBackend):
-    def __init__(self, host="localhost", port=6379, db=0):
-        self.client = redis.StrictRedis(host=host, port=port, db=db)
+    """
+    Redis backend. Values are framed with MessagePack (bytes stay bytes,
+    str stays str) and multi-key access goes through a non-transactional
+    pipeline so a batch costs a single round-trip.
+    """
+    def __init__(self, host="localhost", port=6379, db=0, max_connections=64):
+        self.pool = redis.ConnectionPool(host=host, port=port, db=db, max_connections=max_connections)
+        self.client = redis.StrictRedis(connection_pool=self.pool)
 
-    def get(self, key: str) -> Optional[Any]:
-        data = self.client.get(key)
+    def _pack(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def _unpack(self, data: Optional[bytes]) -> Optional[Any]:
         if data is None:
             return None
-        # Up to you to handle serialization (e.g. pickling)
-        return data
+        try:
+            return msgpack.unpackb(data, raw=False)
+        except Exception as e:
+            # e.g. a raw value written before values were msgpack-framed
+            logger.warning(f"Unreadable cache entry, treating as miss: {e}")
+            return None
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._unpack(self.client.get(key))
 
     def set(self, key: str, value: Any, expire: int = 86400):
-        # e.g., store raw bytes or pickled
-        self.client.set(key, value, ex=expire)
+        self.client.set(key, self._pack(value), ex=expire)
 
     def delete(self, key: str):
         self.client.delete(key)
+
+    def mget(self, keys: Iterable[str]) -> List[Optional[Any]]:
+        keys = list(keys)
+        if not keys:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(key)
+        return [self._unpack(data) for data in pipe.execute()]
+
+    def mset(self, mapping: Dict[str, Any], expire: int = 86400):
+        if not mapping:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, self._pack(value), ex=expire)
+        pipe.execute()
+
+    def update(self, key: str, fn: Callable[[Optional[Any]], Any], expire: int = 86400) -> Any:
+        """
+        Optimistic compare-and-set: WATCH the key, compute fn on what was read
+        and commit with MULTI/EXEC; if another client wrote the key in
+        between, EXEC fails and the update is retried on the new value.
+        """
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    value = fn(self._unpack(pipe.get(key)))
+                    pipe.multi()
+                    pipe.set(key, self._pack(value), ex=expire)
+                    pipe.execute()
+                    return value
+                except redis.WatchError:
+                    continue
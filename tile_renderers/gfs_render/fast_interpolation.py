@@ -1,46 +1,112 @@
 
+import os
 import numpy as np
 import numba
 from numba import prange
 import logging
-# numba.set_num_threads(os.cpu_count())
 logger = logging.getLogger(__name__)
+# Request threads call the parallel kernels concurrently, which workqueue
+# can't do: take TBB (in requirements.txt), or OpenMP if it is missing.
+if "NUMBA_THREADING_LAYER" not in os.environ:
+    numba.config.THREADING_LAYER = "threadsafe"
 
-@numba.njit
-def evaluate_chunk(transform, simplices, vertex_values, query_pts, simplex_indices, start, end, ndim):
+_numba_threads_pid = None
+
+def init_numba_threads() -> None:
+    """
+    Launches numba's thread pool, sized to the machine. Call it in each
+    server process after any fork: a pool launched in a preloading parent
+    does not survive into forked workers. Both servers call it from a
+    startup/per-request hook and gunicorn.conf.py from post_fork; only the
+    first call in each process does anything.
+    """
+    global _numba_threads_pid
+    if _numba_threads_pid == os.getpid():
+        return
+    _numba_threads_pid = os.getpid()
+    numba.set_num_threads(min(os.cpu_count() or 1, numba.config.NUMBA_NUM_THREADS))
+    logger.info(f"numba threading layer: {numba.threading_layer()}")
+
+def _specialize_evaluate_chunk(ndim):
     """
-    Evaluate the interpolator for a chunk of query points.
+    Build an evaluate_chunk kernel for a fixed ndim.
+    NDIM is a closure constant, so numba freezes it at compile time and LLVM
+    can fully unroll the barycentric loops and hoist the shape checks.
     """
-    out = np.empty(end - start, dtype=np.float64)
+    NDIM = ndim
+
+    @numba.njit(fastmath=True, boundscheck=False, nogil=True)
+    def kernel(transform, simplices, vertex_values, query_pts, simplex_indices, start, end, out):
+        for i in range(start, end):
+            s = simplex_indices[i]
+            if s < 0:
+                out[i] = np.nan
+                continue
+            value = 0.0
+            sum_b = 0.0
+            for j in range(NDIM):
+                temp = 0.0
+                for k in range(NDIM):
+                    temp += transform[s, j, k] * (query_pts[i, k] - transform[s, NDIM, k])
+                sum_b += temp
+                value += temp * vertex_values[simplices[s, j]]
+            out[i] = value + (1.0 - sum_b) * vertex_values[simplices[s, NDIM]]
+    return kernel
+
+_evaluate_chunk_3d = _specialize_evaluate_chunk(3)
+_evaluate_chunk_4d = _specialize_evaluate_chunk(4)
+
+@numba.njit(fastmath=True, boundscheck=False, cache=True, nogil=True)
+def evaluate_chunk(transform, simplices, vertex_values, query_pts, simplex_indices, start, end, ndim, out):
+    """
+    Evaluate the interpolator for a chunk of query points, writing
+    out[start:end] in place.
+    No per-point arrays are allocated; the 2-D case is fully unrolled into
+    scalar temps so LLVM can emit fused multiply-adds, and 3-D/4-D dispatch
+    to constant-ndim kernels.
+    """
+    if ndim == 2:
+        for i in range(start, end):
+            s = simplex_indices[i]
+            if s < 0:
+                out[i] = np.nan
+                continue
+            # transform[s] is a (3, 2) array: the last row is the offset.
+            dx = query_pts[i, 0] - transform[s, 2, 0]
+            dy = query_pts[i, 1] - transform[s, 2, 1]
+            b0 = transform[s, 0, 0] * dx + transform[s, 0, 1] * dy
+            b1 = transform[s, 1, 0] * dx + transform[s, 1, 1] * dy
+            b2 = 1.0 - b0 - b1
+            out[i] = (b0 * vertex_values[simplices[s, 0]]
+                      + b1 * vertex_values[simplices[s, 1]]
+                      + b2 * vertex_values[simplices[s, 2]])
+        return
+
+    if ndim == 3:
+        _evaluate_chunk_3d(transform, simplices, vertex_values, query_pts, simplex_indices, start, end, out)
+        return
+    if ndim == 4:
+        _evaluate_chunk_4d(transform, simplices, vertex_values, query_pts, simplex_indices, start, end, out)
+        return
+
     for i in range(start, end):
         s = simplex_indices[i]
         if s < 0:
-            out[i - start] = np.nan
+            out[i] = np.nan
         else:
             # transform[s] is a (ndim+1, ndim) array: the last row is the offset.
-            offset = transform[s, ndim, :]
-            delta = query_pts[i] - offset
-            b = np.empty(ndim, dtype=np.float64)
+            value = 0.0
             sum_b = 0.0
             for j in range(ndim):
                 temp = 0.0
                 for k in range(ndim):
-                    temp += transform[s, j, k] * delta[k]
-                b[j] = temp
+                    temp += transform[s, j, k] * (query_pts[i, k] - transform[s, ndim, k])
                 sum_b += temp
-            bary = np.empty(ndim + 1, dtype=np.float64)
-            for j in range(ndim):
-                bary[j] = b[j]
-            bary[ndim] = 1.0 - sum_b
-            verts = simplices[s]
-            value = 0.0
-            for j in range(ndim + 1):
-                value += bary[j] * vertex_values[verts[j]]
-            out[i - start] = value
-    return out
+                value += temp * vertex_values[simplices[s, j]]
+            value += (1.0 - sum_b) * vertex_values[simplices[s, ndim]]
+            out[i] = value
 
-# @numba.njit(parallel=True)
-@numba.njit
+@numba.njit(parallel=True, fastmath=True, cache=True)
 def fast_interpolate(transform, simplices, vertex_values, query_pts, simplex_indices):
     """
     Evaluate the interpolator for all query points in parallel.
@@ -63,5 +129,167 @@ def fast_interpolate(transform, simplices, vertex_values, query_pts, simplex_ind
     for i in prange(n_chunks):
         start = i * chunk_size
         end = min(start + chunk_size, n_points)
-        out[start:end] = evaluate_chunk(transform, simplices, vertex_values, query_pts, simplex_indices, start, end, ndim)
+        # Chunks cover disjoint [start, end) ranges of the shared buffer.
+        evaluate_chunk(transform, simplices, vertex_values, query_pts, simplex_indices, start, end, ndim, out)
     return out
+
+WALK_MAX_STEPS = 4096
+WALK_FAILED = -2
+
+
+@numba.njit(boundscheck=False, cache=True, inline="always")
+def _walk_2d(transform, neighbors, x, y, s):
+    """
+    Walk from simplex s to the triangle containing (x, y), stepping across the
+    edge opposite the most negative barycentric coordinate until all three are
+    >= -eps (the same tolerance qhull's find_simplex uses).
+
+    Returns (simplex, b0, b1, b2): simplex is -1 when the walk leaves through a
+    hull edge (outside the triangulation, like find_simplex) and WALK_FAILED
+    when it does not converge (degenerate simplex / step limit).
+    """
+    eps = 100 * 2.220446049250313e-16
+    for _ in range(WALK_MAX_STEPS):
+        dx = x - transform[s, 2, 0]
+        dy = y - transform[s, 2, 1]
+        b0 = transform[s, 0, 0] * dx + transform[s, 0, 1] * dy
+        b1 = transform[s, 1, 0] * dx + transform[s, 1, 1] * dy
+        b2 = 1.0 - b0 - b1
+        if b0 >= -eps and b1 >= -eps and b2 >= -eps:
+            return s, b0, b1, b2
+        if not (b0 == b0 and b1 == b1):
+            break  # degenerate simplex (NaN transform)
+        if b0 <= b1 and b0 <= b2:
+            k = 0
+        elif b1 <= b2:
+            k = 1
+        else:
+            k = 2
+        nxt = neighbors[s, k]
+        if nxt < 0:
+            return -1, 0.0, 0.0, 0.0
+        s = nxt
+    return WALK_FAILED, 0.0, 0.0, 0.0
+
+
+@numba.njit(parallel=True, boundscheck=False, cache=True)
+def interp_grid(transform, simplices, neighbors, values, query_pts, row_seeds, out, failed):
+    """
+    Fused 2-D tile interpolation: locate + barycentric weights + dot product.
+
+    query_pts is the row-major (rows*cols, 2) tile grid and out the (rows, cols)
+    result. Rows run in parallel; within a row each walk starts from the left
+    neighbour's simplex (row_seeds[r] for the first point, -1 if unknown), which
+    is usually the answer or one step away. Points outside the triangulation get
+    NaN; points the walk can't settle are flagged in failed (and left NaN) for
+    the caller to redo with tri.find_simplex.
+    """
+    rows, cols = out.shape
+    for r in prange(rows):
+        s = row_seeds[r]
+        if s < 0:
+            s = 0
+        for c in range(cols):
+            i = r * cols + c
+            found, b0, b1, b2 = _walk_2d(transform, neighbors, query_pts[i, 0], query_pts[i, 1], s)
+            if found < 0:
+                out[r, c] = np.nan
+                failed[i] = found == WALK_FAILED
+                continue
+            failed[i] = False
+            out[r, c] = (b0 * values[simplices[found, 0]]
+                         + b1 * values[simplices[found, 1]]
+                         + b2 * values[simplices[found, 2]])
+            s = found
+
+
+@numba.njit(boundscheck=False, cache=True, nogil=True)
+def finalize_grid(grid, missing_val, missing_mask):
+    """
+    One pass over a 2-D tile grid: cells within np.isclose(..., atol=1.0) of
+    missing_val (and NaNs) become NaN in place and are flagged in
+    missing_mask. Returns whether any cell holds data. No fastmath, so the
+    NaN tests are kept.
+    """
+    tol = 1.0 + 1e-5 * abs(missing_val)
+    any_valid = False
+    for i in range(grid.shape[0]):
+        for j in range(grid.shape[1]):
+            v = grid[i, j]
+            if np.isnan(v) or abs(v - missing_val) <= tol:
+                grid[i, j] = np.nan
+                missing_mask[i, j] = True
+            else:
+                missing_mask[i, j] = False
+                any_valid = True
+    return any_valid
+
+
+TILE_PIXELS = 256  # visible tile edge; the oversize row/column is never drawn
+# Rows this close outside a grid's edge rows still count as on them (float
+# noise of the Mercator round trip)
+ROW_EDGE_EPS = 1e-6
+
+
+@numba.njit(parallel=True, boundscheck=False, cache=True)
+def render_grid_tile(values, rows, cols, missing_val, lut, gmin, scale, thr_idx, zero_clip, out):
+    """
+    A whole regular-grid tile in one pass: bilinear value at fractional
+    (rows[i], cols[j]) with map_coordinates' order=1 rule, wrapping columns
+    only (computed in double, rounded to float32); rows outside the grid are
+    missing, as in GridInterpolator. Then the finalize_grid missing test and the
+    _colorize_kernel LUT/alpha rules, written straight into the (256, 256, 4)
+    out. Loop bounds are the fixed TILE_PIXELS. Returns whether any pixel
+    holds data; no fastmath, so the NaN tests are kept.
+    """
+    ny, nx = values.shape
+    top = lut.shape[0] - 1
+    tol = 1.0 + 1e-5 * abs(missing_val)
+    row_valid = np.zeros(TILE_PIXELS, dtype=np.bool_)
+    for i in prange(TILE_PIXELS):
+        r = rows[i]
+        if r < -ROW_EDGE_EPS or r > ny - 1 + ROW_EDGE_EPS:
+            # Beyond the grid's latitude band: the whole row is missing
+            for j in range(TILE_PIXELS):
+                out[i, j, 0] = lut[0, 0]
+                out[i, j, 1] = lut[0, 1]
+                out[i, j, 2] = lut[0, 2]
+                out[i, j, 3] = 0
+            continue
+        r = min(max(r, 0.0), ny - 1.0)
+        r_floor = np.floor(r)
+        fr = r - r_floor
+        r0 = int(r_floor)
+        r1 = min(r0 + 1, ny - 1)
+        for j in range(TILE_PIXELS):
+            c = cols[j]
+            c_floor = np.floor(c)
+            fc = c - c_floor
+            c0 = int(c_floor) % nx
+            c1 = (c0 + 1) % nx
+            v = np.float32(
+                (1.0 - fr) * ((1.0 - fc) * values[r0, c0] + fc * values[r0, c1])
+                + fr * ((1.0 - fc) * values[r1, c0] + fc * values[r1, c1])
+            )
+            if np.isnan(v) or abs(v - missing_val) <= tol:
+                out[i, j, 0] = lut[0, 0]
+                out[i, j, 1] = lut[0, 1]
+                out[i, j, 2] = lut[0, 2]
+                out[i, j, 3] = 0
+                continue
+            row_valid[i] = True
+            t = (v - gmin) * scale
+            if t >= top:
+                idx = top
+            elif t > 0:
+                idx = int(t)
+            else:
+                idx = 0
+            out[i, j, 0] = lut[idx, 0]
+            out[i, j, 1] = lut[idx, 1]
+            out[i, j, 2] = lut[idx, 2]
+            if zero_clip:
+                out[i, j, 3] = 0 if idx < thr_idx else 255
+            else:
+                out[i, j, 3] = lut[idx, 3]
+    return row_valid.any()
@@ -1,21 +1,157 @@
 # interpolator.py
+import hashlib
+import os
+import pickle
+import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
 from scipy.spatial import Delaunay
 from scipy.interpolate import LinearNDInterpolator
+from scipy.ndimage import map_coordinates, uniform_filter
+# Never let PROJ reach out for grid files while projecting tile data.
+os.environ.setdefault("PROJ_NETWORK", "OFF")
 from pyproj import Transformer, exceptions as proj_exceptions
+from .fast_interpolation import ROW_EDGE_EPS
 import logging
 # Configure logging for debugging purposes
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Below this many points a single proj call is cheaper than fanning out.
+TRANSFORM_CHUNK_MIN = 100_000
+# WGS84 semi-major axis used by EPSG:3857
+EARTH_RADIUS = 6378137.0
+MERCATOR_LAT_LIMIT = 85.05112878
+
+
+def prune_cache_dir(cache_dir: str, max_age: float) -> int:
+    """
+    Delete files in cache_dir whose mtime is more than max_age seconds old.
+    Readers touch the files they hit, so only entries nothing has used
+    lately (e.g. those of deleted GRIB runs) go. Returns how many were removed.
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(cache_dir))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass
+    if removed:
+        logger.info(f"Pruned {removed} stale files from {cache_dir}")
+    return removed
+
+
+def box_decimate(data: np.ndarray, step: int, periodic_lon: bool) -> np.ndarray:
+    """
+    Every step-th row/col of a 2-D field after a centred box filter (odd
+    width >= step), so samples stay on their own lat/lon while the detail the
+    stride would alias is averaged out. Longitude wraps on global grids.
+    Masked/non-finite cells neither bleed into neighbours (normalised
+    convolution) nor change themselves. Returns float32.
+    """
+    size = step | 1
+    mode = ("nearest", "wrap" if periodic_lon else "nearest")
+    values = np.array(np.ma.getdata(data), dtype=np.float32)
+    valid = np.isfinite(values) & ~np.ma.getmaskarray(data)
+    if valid.all():
+        return np.ascontiguousarray(uniform_filter(values, size=size, mode=mode)[::step, ::step])
+    weight = uniform_filter(valid.astype(np.float32), size=size, mode=mode)
+    summed = uniform_filter(np.where(valid, values, np.float32(0)), size=size, mode=mode)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        smoothed = np.where(valid & (weight > 0), summed / weight, values)
+    return np.ascontiguousarray(smoothed[::step, ::step])
+
+class GridInterpolator:
+    """
+    Bilinear interpolator over a regular lat/lon grid that wraps the globe
+    in longitude. Query points are Web Mercator (x, y) pairs, like
+    LinearNDInterpolator's, and are mapped back to fractional (row, col)
+    indices analytically. Only columns wrap: points outside the grid's
+    latitude band are NaN.
+    """
+    def __init__(self, values: np.ndarray, lat0: float, dlat: float, lon0: float, dlon: float):
+        # float32 halves the cached/pickled grid; map_coordinates still
+        # interpolates in double and hands back float32.
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+        self.lat0 = lat0
+        self.dlat = dlat
+        self.lon0 = lon0
+        self.dlon = dlon
+
+    def __call__(self, pts: np.ndarray) -> np.ndarray:
+        pts = np.asarray(pts, dtype=np.float64)
+        lon = np.degrees(pts[:, 0] / EARTH_RADIUS)
+        lat = np.degrees(np.arctan(np.sinh(pts[:, 1] / EARTH_RADIUS)))
+        np.clip(lat, -MERCATOR_LAT_LIMIT, MERCATOR_LAT_LIMIT, out=lat)
+        rows = (lat - self.lat0) / self.dlat
+        cols = np.mod(lon - self.lon0, 360.0) / self.dlon
+        # grid-wrap closes the longitude seam, but it wraps rows too
+        out = map_coordinates(self.values, [rows, cols], order=1, mode="grid-wrap")
+        out[self._rows_outside(rows)] = np.nan
+        return out
+
+    def axis_coords(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fractional (rows, cols) indices for Web Mercator axes ys and xs.
+        The projection is separable, so lon/lat (and the index math) are
+        computed per axis rather than per point.
+        """
+        lon = np.degrees(np.asarray(xs, dtype=np.float64) / EARTH_RADIUS)
+        lat = np.degrees(np.arctan(np.sinh(np.asarray(ys, dtype=np.float64) / EARTH_RADIUS)))
+        np.clip(lat, -MERCATOR_LAT_LIMIT, MERCATOR_LAT_LIMIT, out=lat)
+        return (lat - self.lat0) / self.dlat, np.mod(lon - self.lon0, 360.0) / self.dlon
+
+    def grid(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Values on the (len(ys), len(xs)) grid spanned by Web Mercator axes.
+        """
+        rows, cols = self.axis_coords(xs, ys)
+        coords = np.empty((2, rows.size, cols.size), dtype=np.float64)
+        coords[0] = rows[:, None]
+        coords[1] = cols[None, :]
+        out = map_coordinates(self.values, coords, order=1, mode="grid-wrap")
+        out[self._rows_outside(rows)] = np.nan
+        return out
+
+    def _rows_outside(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Mask of fractional rows beyond the first/last grid row, give or take
+        the float noise of the Mercator round trip on the edge rows.
+        """
+        return (rows < -ROW_EDGE_EPS) | (rows > self.values.shape[0] - 1 + ROW_EDGE_EPS)
+
+    @property
+    def domain_bbox(self) -> Tuple[float, float, float, float]:
+        """
+        Web Mercator (min_x, min_y, max_x, max_y) the grid covers. Longitudes
+        wrap, so x always spans the world; y runs over the grid's latitudes.
+        """
+        lat_a = self.lat0
+        lat_b = self.lat0 + self.dlat * (self.values.shape[0] - 1)
+        lats = np.clip([min(lat_a, lat_b), max(lat_a, lat_b)], -MERCATOR_LAT_LIMIT, MERCATOR_LAT_LIMIT)
+        ys = EARTH_RADIUS * np.log(np.tan(np.pi / 4 + np.radians(lats) / 2))
+        half_world = np.pi * EARTH_RADIUS
+        return -half_world, float(ys[0]), half_world, float(ys[1])
+
 class Interpolator:
     """
     A wrapper class to build and manage the LinearNDInterpolator with multithreading optimizations.
     """
-    def __init__(self, transformer: Transformer | None = None):
+    def __init__(self, transformer: Transformer | None = None, cache_dir: str | None = None):
         """
         Initializes the Interpolator by setting up the transformer.
+        When cache_dir is set, Delaunay triangulations are persisted there and
+        reused for identical point sets.
         """
+        self.cache_dir = cache_dir
         try:
             self.transformer = transformer if transformer is not None else Transformer.from_crs("epsg:4326", "epsg:3857", always_xy=True)
             logger.info("Interpolator: Transformer initialized successfully.")
@@ -23,36 +159,147 @@ class Interpolator:
             logger.error(f"Interpolator: Failed to initialize transformer: {e}")
             raise ValueError(f"Interpolator: Transformer initialization failed: {e}")
 
-    def build_interpolator(self, data, lats, lons, lat_flip=False,  decimation: int  = 1):
+    def transform_inplace(self, xx: np.ndarray, yy: np.ndarray) -> None:
+        """
+        Project contiguous float64 lon/lat buffers in place.
+        Large inputs are split into cpu_count() slices transformed on worker
+        threads; pyproj releases the GIL while PROJ runs.
+        """
+        n = xx.size
+        workers = os.cpu_count() or 1
+        if workers == 1 or n < TRANSFORM_CHUNK_MIN:
+            self.transformer.transform(xx, yy, inplace=True)
+            return
+        bounds = np.linspace(0, n, workers + 1, dtype=np.int64)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.transformer.transform, xx[lo:hi], yy[lo:hi], inplace=True)
+                for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo
+            ]
+            for fut in futures:
+                fut.result()
+
+    def _get_or_build_delaunay(self, points: np.ndarray) -> Delaunay:
+        """
+        Triangulate points, reusing a triangulation stored on disk for the
+        exact same point set (keyed by a digest of the coordinates).
+        """
+        if not self.cache_dir:
+            return Delaunay(points)
+        digest = hashlib.blake2b(np.ascontiguousarray(points).tobytes(), digest_size=16).hexdigest()
+        path = os.path.join(self.cache_dir, f"delaunay_{digest}.pkl")
+        try:
+            with open(path, "rb") as f:
+                tri = pickle.load(f)
+            try:
+                os.utime(path)  # still in use: keep it out of prune_cache_dir
+            except OSError:
+                pass
+            return tri
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Interpolator: Ignoring unreadable triangulation cache {path}: {e}")
+
+        tri = Delaunay(points)
+        tri.transform  # computed now so it is stored with the simplices
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(tri, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Interpolator: Could not write triangulation cache {path}: {e}")
+        return tri
+
+    def _regular_grid_axes(self, lats: np.ndarray, lons: np.ndarray) -> tuple[float, float, float, float] | None:
+        """
+        Returns (lat0, dlat, lon0, dlon) when lats/lons describe a uniformly
+        spaced grid that wraps the full globe in longitude, otherwise None.
         """
-        Builds a CPU-based LinearNDInterpolator using Delaunay triangulation.
+        if lats.ndim != 2 or lons.ndim != 2 or lats.shape != lons.shape:
+            return None
+        rows, cols = lats.shape
+        if rows < 2 or cols < 2:
+            return None
+        lat_axis = lats[:, 0]
+        lon_axis = lons[0, :]
+        dlat = float(lat_axis[1] - lat_axis[0])
+        dlon = float(lon_axis[1] - lon_axis[0])
+        if dlat == 0.0 or dlon <= 0.0:
+            return None
+        if not (np.allclose(np.diff(lat_axis), dlat) and np.allclose(np.diff(lon_axis), dlon)):
+            return None
+        if not (np.allclose(lats, lat_axis[:, None]) and np.allclose(lons, lon_axis[None, :])):
+            return None
+        if not np.isclose(cols * dlon, 360.0):
+            return None
+        return float(lat_axis[0]), dlat, float(lon_axis[0]), dlon
+
+    def build_interpolator(self, data, lats, lons, decimation: int  = 1, grid_mode: bool = True):
+        """
+        Builds a CPU-based interpolator.
+        Regular global lat/lon grids (e.g. GFS 0p25) get a GridInterpolator that
+        does bilinear lookups with no triangulation; anything else falls back
+        to a LinearNDInterpolator over a Delaunay triangulation.
+        decimation keeps every decimation-th point: box-filtered rows/columns
+        on regular grids, a stride over the flattened points otherwise.
+        lats are used as given; any scan-direction handling is the caller's.
         """
-        if lat_flip:
-            lats = -lats
-        lats = np.clip(lats, -85.05112878, 85.05112878)
-        lons = (lons + 180) % 360 - 180
-        flt_lat = lats.ravel()[::decimation]
-        flt_lon = lons.ravel()[::decimation]
-        flt_dat = data.ravel()[::decimation]
+        if grid_mode:
+            axes = self._regular_grid_axes(lats, lons)
+            # A stride that doesn't divide the columns can't close the 360° seam
+            if axes is not None and (decimation <= 1 or lons.shape[1] % decimation == 0):
+                values = data
+                if decimation > 1:
+                    lat0, dlat, lon0, dlon = axes
+                    axes = (lat0, dlat * decimation, lon0, dlon * decimation)
+                    values = box_decimate(data, decimation, periodic_lon=True)
+                return GridInterpolator(np.asarray(values), *axes)
+
+        # Decimate first (views of the raveled grids), then write every
+        # transformed copy straight into preallocated, final-sized buffers.
+        flt_lat = np.asarray(lats).ravel()[::decimation]
+        flt_lon = np.asarray(lons).ravel()[::decimation]
+        flt_dat = np.asarray(data).ravel()[::decimation]
+        n = flt_lat.size
+
+        wrapped_lon = np.add(flt_lon, 180.0)
+        np.mod(wrapped_lon, 360.0, out=wrapped_lon)
+        wrapped_lon -= 180.0
         # Duplicate points near the antimeridian (±180°)
         dl_thresh = 1.0
-        mask_dl = (np.abs(flt_lon) >= (180 - dl_thresh))
-        dup_lon = flt_lon[mask_dl] + 360 * np.where(flt_lon[mask_dl] < 0, 1, -1)
-        dup_lat = flt_lat[mask_dl]
-        dup_dat = flt_dat[mask_dl]
-        flt_lon = np.concatenate([flt_lon, dup_lon])
-        flt_lat = np.concatenate([flt_lat, dup_lat])
-        flt_dat = np.concatenate([flt_dat, dup_dat])
-
-        fx, fy = self.transformer.transform(flt_lon, flt_lat)
-
-        # Validate data
-        valid_mask = ~np.isnan(fx) & ~np.isnan(fy) & ~np.isnan(flt_dat)
-        valid_mask &= ~np.isinf(fx) & ~np.isinf(fy) & ~np.isinf(flt_dat)
+        dup_idx = np.flatnonzero(np.abs(wrapped_lon) >= (180 - dl_thresh))
+        total = n + dup_idx.size
+
+        all_lon = np.empty(total, dtype=np.float64)
+        all_lat = np.empty(total, dtype=np.float64)
+        all_dat = np.empty(total, dtype=np.float64)
+        all_lon[:n] = wrapped_lon
+        all_lat[:n] = flt_lat
+        np.clip(all_lat[:n], -85.05112878, 85.05112878, out=all_lat[:n])
+        all_dat[:n] = flt_dat
+
+        dup_lon = wrapped_lon[dup_idx]
+        all_lon[n:] = dup_lon + np.where(dup_lon < 0, 360.0, -360.0)
+        all_lat[n:] = all_lat[dup_idx]
+        all_dat[n:] = all_dat[dup_idx]
+
+        # all_lon/all_lat are private buffers, so project them in place
+        self.transform_inplace(all_lon, all_lat)
+        fx, fy = all_lon, all_lat
+
+        # Validate data in a single finite-check per array
+        valid_mask = np.isfinite(fx)
+        valid_mask &= np.isfinite(fy)
+        valid_mask &= np.isfinite(all_dat)
         fx = fx[valid_mask]
         fy = fy[valid_mask]
-        flt_dat = flt_dat[valid_mask]
+        flt_dat = all_dat[valid_mask]
 
-        tri = Delaunay(np.column_stack((fx, fy)))
+        tri = self._get_or_build_delaunay(np.column_stack((fx, fy)))
         ip = LinearNDInterpolator(tri, flt_dat, fill_value=np.nan)
+        # Outside the hull every pixel is NaN, so tiles beyond this are blank
+        ip.domain_bbox = (float(fx.min()), float(fy.min()), float(fx.max()), float(fy.max()))
         return ip
@@ -1,52 +1,151 @@
+import functools
+import re
+import threading
+from itertools import chain
 from typing import Any, List, Dict, Union, Tuple
 import numpy as np
-from matplotlib.colors import LinearSegmentedColormap, Normalize
+from numba import njit, prange
+from matplotlib.colors import Colormap, LinearSegmentedColormap
 import matplotlib.pyplot as plt
 
+LUT_SIZE = 256  # matplotlib's default colormap resolution
+COLORIZE_BLOCK = 64  # 64x64 float32 block = 16 KB, fits L1/L2 with the LUT
+
+_NO_MASK = np.zeros((1, 1, 1), dtype=np.bool_)
+
+_PRECIP_RE = re.compile(r"precipitation|rain|snow|graupel|mixing|reflectivity")
+_CLOUD_OR_PRECIP_RE = re.compile(r"cloud|precipitation|rain|snow|graupel|mixing|reflectivity")
+_PRESSURE_RE = re.compile(r"pressure|height|vorticity")
+
+
+@functools.lru_cache(maxsize=64)
+def _get_cmap(cmap_name_or_obj: Union[str, Colormap]) -> Colormap:
+    """
+    Resolve a colormap name once per process.
+    """
+    if isinstance(cmap_name_or_obj, Colormap):
+        return cmap_name_or_obj
+    return plt.get_cmap(cmap_name_or_obj)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_lut(cmap_name_or_obj: Union[str, Colormap], num_colors: int = 256) -> np.ndarray:
+    """
+    8-bit RGBA lookup table (num_colors, 4) for a colormap, built once.
+    The cached array is read-only; copy it before modifying.
+    """
+    float_array = _get_cmap(cmap_name_or_obj)(np.linspace(0, 1, num_colors))
+    # C-contiguous (num_colors,4) so each gather reads one 4-byte row and numba
+    # compiles the kernel against a 'C' layout
+    lut = np.ascontiguousarray((float_array * 255).astype(np.uint8))
+    lut.setflags(write=False)
+    return lut
+
+
+# fastmath minus 'nnan'/'ninf': the kernel must still see NaN (missing) cells
+_COLORIZE_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(parallel=True, fastmath=_COLORIZE_FASTMATH, cache=True)
+def _colorize_kernel(data, mask, use_mask, lut, gmin, scale, thr_idx, zero_clip, out):
+    """
+    Single pass per pixel: normalize => LUT index => RGBA, with the zero-clip
+    alpha cutoff and missing-data alpha folded in. data/mask are (T,H,W) and
+    out is (T,H,W,4) uint8; with use_mask=False the mask is ignored and NaN
+    cells are treated as missing inline (no separate isnan pass). gmin/scale
+    are float32 so the index matches the float32 path. Work is split into
+    COLORIZE_BLOCK x COLORIZE_BLOCK blocks (prange over every frame's row
+    blocks) so each block's input/output stays cache resident alongside the
+    1 KB LUT.
+    """
+    T, H, W = data.shape
+    top = lut.shape[0] - 1
+    n_row_blocks = (H + COLORIZE_BLOCK - 1) // COLORIZE_BLOCK
+    for tb in prange(T * n_row_blocks):
+        f = tb // n_row_blocks
+        i0 = (tb % n_row_blocks) * COLORIZE_BLOCK
+        i1 = min(i0 + COLORIZE_BLOCK, H)
+        for j0 in range(0, W, COLORIZE_BLOCK):
+            j1 = min(j0 + COLORIZE_BLOCK, W)
+            for i in range(i0, i1):
+                for j in range(j0, j1):
+                    v = data[f, i, j]
+                    if mask[f, i, j] if use_mask else np.isnan(v):
+                        out[f, i, j, 0] = lut[0, 0]
+                        out[f, i, j, 1] = lut[0, 1]
+                        out[f, i, j, 2] = lut[0, 2]
+                        out[f, i, j, 3] = 0
+                        continue
+                    t = (np.float32(v) - gmin) * scale
+                    if t >= top:
+                        idx = top
+                    elif t > 0:
+                        idx = int(t)
+                    else:
+                        idx = 0  # also catches NaN
+                    out[f, i, j, 0] = lut[idx, 0]
+                    out[f, i, j, 1] = lut[idx, 1]
+                    out[f, i, j, 2] = lut[idx, 2]
+                    # Alpha straight from the integer index: one compare, no float mask
+                    if zero_clip:
+                        out[f, i, j, 3] = 0 if idx < thr_idx else 255
+                    else:
+                        out[f, i, j, 3] = lut[idx, 3]
+
+
+@functools.lru_cache(maxsize=1024)
+def _assign_color_map(model: str, param_name: str) -> Union[str, LinearSegmentedColormap]:
+    lower_name = param_name.lower()
+
+    if _PRECIP_RE.search(lower_name):
+        return "rainbow"
+    if "temperature" in lower_name:
+        return "jet"
+    if "direction" in lower_name:
+        return "hsv"
+    if "wind" in lower_name:
+        return "viridis"
+    if "humidity" in lower_name:
+        return "YlGnBu"
+    if _PRESSURE_RE.search(lower_name):
+        return "plasma"
+    if "cloud" in lower_name:
+        return "twilight"
+
+    return "viridis"
+
+
+@functools.lru_cache(maxsize=256)
+def _zero_clip(param_name: str) -> bool:
+    return _CLOUD_OR_PRECIP_RE.search(param_name.lower()) is not None
+
+
 class MapColors:
 
-    # def __init__(self):
-    #     self.precip_cmap = self._create_precip_cmap()
-
-    # def _create_precip_cmap(self) -> LinearSegmentedColormap:
-    #     """
-    #     Create a custom precipitation colormap.
-    #     """
-    #     colors = [
-    #         (0.0, 0.0, 0.0, 0.0),
-    #         (0.0, 0.0, 1.0, 0.6),
-    #         (0.0, 0.2, 1.0, 1.0),
-    #         (0.0, 0.5, 1.0, 1.0),
-    #         (0.0, 1.0, 0.5, 1.0),
-    #         (1.0, 1.0, 0.0, 1.0),
-    #         (1.0, 0.3, 0.0, 1.0),
-    #         (1.0, 0.0, 1.0, 1.0),
-    #     ]
-    #     positions = [0.0, 0.01, 0.15, 0.25, 0.35, 0.55, 0.7, 1.0]
-    #     return LinearSegmentedColormap.from_list("expanded_precip", list(zip(positions, colors)))
+    def __init__(self):
+        # Per-thread output buffers keyed by (shape, dtype); see _get_buffer
+        self._buf_cache = threading.local()
+
+    def _get_buffer(self, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """
+        Return a reusable uninitialised array for this thread. Buffers are
+        per-thread so concurrent renders sharing one MapColors never collide.
+        """
+        bufs = getattr(self._buf_cache, "bufs", None)
+        if bufs is None:
+            bufs = self._buf_cache.bufs = {}
+        key = (shape, np.dtype(dtype))
+        buf = bufs.get(key)
+        if buf is None:
+            buf = bufs[key] = np.empty(shape, dtype=dtype)
+        return buf
 
     def assign_color_map(self, model: str, param_name: str) -> Union[str, LinearSegmentedColormap]:
         """
         Assign a suitable colormap based on the parameter name.
+        Memoized per (model, param_name).
         """
-        lower_name = param_name.lower()
-
-        if any(k in lower_name for k in ["precipitation", "rain", "snow", "graupel", "mixing", "reflectivity"]):
-            return "rainbow" # self.precip_cmap
-        if "temperature" in lower_name:
-            return "jet"
-        if "direction" in lower_name:
-            return "hsv"
-        if "wind" in lower_name:
-            return "viridis"
-        if "humidity" in lower_name:
-            return "YlGnBu"
-        if any(k in lower_name for k in ["pressure", "height", "vorticity"]):
-            return "plasma"
-        if "cloud" in lower_name:
-            return "twilight"
-
-        return "viridis"
+        return _assign_color_map(model, param_name)
 
     def _assign_color_map_with_colors(
         self,
@@ -64,18 +163,11 @@ class MapColors:
         """
         # 1) Determine the base colormap (name or object)
         cmap_name_or_obj = self.assign_color_map(model, param_name)
-        cmap_obj = (
-            cmap_name_or_obj if isinstance(cmap_name_or_obj, LinearSegmentedColormap)
-            else plt.get_cmap(cmap_name_or_obj)
-        )
 
-        # 2) Generate floating-point RGBA in [0..1]
-        float_array = cmap_obj(np.linspace(0, 1, num_colors))  # shape => (num_colors,4)
+        # 2) 8-bit RGBA in [0..255] from the cached LUT (copied, we may edit alpha)
+        color_array_8bit = _build_lut(cmap_name_or_obj, num_colors).copy()  # shape => (num_colors,4)
 
-        # 3) Convert floats => 8-bit RGBA in [0..255]
-        color_array_8bit = (float_array * 255).astype(np.uint8)
-
-        # 4) If param_name includes "cloud", do alpha adjustments
+        # 3) If param_name includes "cloud", do alpha adjustments
         if self.zero_clip(param_name):
             # Example (A): set alpha=0 for the first color => 0% coverage fully transparent
             # color_array_8bit[0, 3] = 0
@@ -83,9 +175,9 @@ class MapColors:
             # Example (B): fade alpha from 0..10% coverage.
             #   i.e., first ~10% of color_array => alpha=0..255 linearly
             fade_stop = int(num_colors * 0.1)  # ~10%
-            for i in range(fade_stop):
-                alpha_val = int(255 * (i / (fade_stop - 1 if fade_stop>1 else 1)))
-                color_array_8bit[i, 3] = alpha_val
+            if fade_stop > 0:
+                ramp = np.arange(fade_stop) / max(fade_stop - 1, 1)
+                color_array_8bit[:fade_stop, 3] = (255 * ramp).astype(np.uint8)
 
         return cmap_name_or_obj, color_array_8bit
 
@@ -93,220 +185,73 @@ class MapColors:
         """
         Returns True if the value is 0, False otherwise.
         """
-        lower_name = param_name.lower()
-        return any(k in lower_name for k in ["cloud", "precipitation", "rain", "snow", "graupel", "mixing", "reflectivity"])
-
-    def colorize_grid_ALTERED(
-        self,
-        model: str,
-        param_name: str,
-        data_2d: np.ndarray,
-        gmin: float,
-        gmax: float,
-        missing_mask: np.ndarray | None = None
-    ) -> np.ndarray:
-        """
-        Convert a 2D data array into an RGBA uint8 image of shape (H,W,4).
-        Minimizes halo by forcing alpha=0 below a threshold, alpha=255 above.
-        Also sets interpolation=nearest at the end if you are using matplotlib.
-        """
-        if missing_mask is None:
-            missing_mask = np.isnan(data_2d)
+        return _zero_clip(param_name)
 
-        tmp_data = data_2d.copy()
-        tmp_data[missing_mask] = gmin
-
-        norm = Normalize(vmin=gmin, vmax=gmax)
-
-        # 1) We pick a colormap and ensure its first portion is the same color.
-        #    We'll build a 'constant' section from 0..0.02 => the same color
-        #    so no hue shift near zero.
-        base_cmap_name = self.assign_color_map(model, param_name)
-        base_cmap = (base_cmap_name if isinstance(base_cmap_name, LinearSegmentedColormap)
-                    else plt.get_cmap(base_cmap_name))
-
-        # Example: we morph the colormap so that 0..0.02 is constant:
-        # We build a new colormap array, adjusting the first 2% to be the color at 2%.
-        new_n = 256
-        base_vals = base_cmap(np.linspace(0, 1, new_n))  # shape=(256,4) float
-        # copy color at i=5 => ~2% into the colormap
-        boundary_idx = int(new_n * 0.02)
-        constant_color = base_vals[boundary_idx, :].copy()
-        for i in range(boundary_idx):
-            base_vals[i, :] = constant_color
-
-        # Now make a new colormap from these modified values
-        new_cmap = LinearSegmentedColormap.from_list("modified_cmap", base_vals)
-
-        # 2) Map our data => [0..1]
-        normed_data = norm(tmp_data)
-
-        # 3) Convert to RGBA in [0..1] by calling the new colormap
-        rgba_float = new_cmap(normed_data)
-
-        # 4) Convert to 8-bit => shape (H,W,4) in [0..255]
-        rgba_8u = (rgba_float * 255).astype(np.uint8)
-
-        # 5) Hard alpha cutoff: normed_data < threshold => alpha=0, else alpha=255
-        if self.zero_clip(param_name):
-            threshold = 0.2  # same as your constant region
-            is_below = (normed_data < threshold)
-            rgba_8u[is_below, 3] = 0
-            rgba_8u[~is_below, 3] = 255
-
-        # 6) Missing data => alpha=0
-        rgba_8u[missing_mask, 3] = 0
-
-        return rgba_8u
-
-    def colorize_grid_ORIG(
+    def colorize_grid(
         self,
         model: str,
         param_name: str,
         data_2d: np.ndarray,
         gmin: float,
         gmax: float,
-        missing_mask: np.ndarray | None = None
+        missing_mask: np.ndarray | None = None,
+        reuse_output: bool = False
     ) -> np.ndarray:
         """
-        Convert a 2D data array into an RGBA uint8 image of shape (H,W,4).
+        Returns an (H,W,4) RGBA uint8 array.
+        We'll do a binary alpha cutoff for near-zero data => alpha=0.
+        With reuse_output=True the result lives in a per-thread buffer that the
+        next call on this thread overwrites; copy it if you need to keep it.
         """
-
-        # 1) If no explicit missing_mask, define it from nan
-        if missing_mask is None:
-            missing_mask = np.isnan(data_2d)
-
-        # 2) Temporary fill missing data with gmin for color-scaling
-        tmp_data = data_2d.copy()
-        tmp_data[missing_mask] = gmin
-
-        # 3) Build normalizer
-        norm = Normalize(vmin=gmin, vmax=gmax)
-
-        # 4) Pick the colormap
-        cmap_name_or_obj = self.assign_color_map(model, param_name)
-        if isinstance(cmap_name_or_obj, LinearSegmentedColormap):
-            cmap_obj = cmap_name_or_obj
-        else:
-            cmap_obj = plt.get_cmap(cmap_name_or_obj)
-
-        # 5) Apply normalization => [0..1]
-        normed_data = norm(tmp_data)  # shape => (H,W) in [0..1]
-
-        # 6) Convert to RGBA => shape (H,W,4) in float [0..1]
-        rgba_float = cmap_obj(normed_data)
-
-        # 7) Convert to 8-bit => shape (H,W,4) in [0..255]
-        rgba_8u = (rgba_float * 255).astype(np.uint8)
-
-        # 8) If we need to clip near zero => alpha=0
-        #    Because partial alpha near 0 can cause a "halo" or "border" effect,
-        #    we do a binary threshold. For example, any data < fade_threshold => alpha=0
-        if self.zero_clip(param_name):
-            fade_threshold = 0.02  # in normalized space (0..1). Adjust as needed
-            fade_region = (normed_data < fade_threshold)
-            rgba_8u[fade_region, 3] = 0  # fully transparent for near-zero values
-            # optionally, for data above fade_threshold => alpha=255 (already is by default)
-            # but if you want to ensure no partial alpha, do:
-            rgba_8u[~fade_region, 3] = 255
-
-        # 9) Missing data => alpha=0
-        rgba_8u[missing_mask, 3] = 0
-
-        return rgba_8u
-
-    def colorize_grid_third(
-        self,
-        model: str,
-        param_name: str,
-        data_2d: np.ndarray,
-        gmin: float,
-        gmax: float,
-        missing_mask: np.ndarray | None = None
-    ) -> np.ndarray:
+        return self.colorize_grid_batch(
+            model, param_name, data_2d[np.newaxis], gmin, gmax,
+            None if missing_mask is None else missing_mask[np.newaxis],
+            reuse_output=reuse_output
+        )[0]
+
+    def colorize_params(
+        self, model: str, param_name: str, gmin: float, gmax: float
+    ) -> Tuple[np.ndarray, np.float32, np.float32, int, bool]:
         """
-        Returns (H,W,4) RGBA in uint8, with alpha=0 for near-zero if 'zeroClip' is True,
-        alpha=255 otherwise, to avoid halo borders.
+        (lut, gmin, scale, thr_idx, zero_clip) as the colorize kernels take
+        them, for kernels that colorize on their own (e.g. render_grid_tile).
         """
-        from matplotlib.colors import LinearSegmentedColormap, Normalize
-        import matplotlib.pyplot as plt
-        import numpy as np
-
-        if missing_mask is None:
-            missing_mask = np.isnan(data_2d)
-
-        tmp_data = data_2d.copy()
-        tmp_data[missing_mask] = gmin
-
-        norm = Normalize(vmin=gmin, vmax=gmax)
-
-        cmap_name_or_obj = self.assign_color_map(model, param_name)
-        if isinstance(cmap_name_or_obj, LinearSegmentedColormap):
-            cmap_obj = cmap_name_or_obj
-        else:
-            cmap_obj = plt.get_cmap(cmap_name_or_obj)
-
-        # => Convert data => normalized => then colormap => float RGBA => 8-bit
-        normed_data = norm(tmp_data)
-        rgba_float = cmap_obj(normed_data)
-        rgba_8u = (rgba_float * 255).astype(np.uint8)
-
-        if self.zero_clip(param_name):
-            # Example binary alpha cutoff at normed_data < 0.02 => alpha=0, else=255
-            threshold = 0.02
-            is_below = (normed_data < threshold)
-            rgba_8u[is_below, 3] = 0
-            rgba_8u[~is_below, 3] = 255
-
-        # Missing => alpha=0
-        rgba_8u[missing_mask, 3] = 0
-
-        return rgba_8u
-
-
-    def colorize_grid(
+        lut = _build_lut(self.assign_color_map(model, param_name), LUT_SIZE)
+        # Index math mirrors Colormap.__call__: floor(normed * N), clipped to N-1.
+        # Hard alpha cutoff near zero => no partial alpha (below 0.02 => 0, else 255).
+        # Missing data => alpha=0.
+        threshold = 0.02
+        scale = np.float32(LUT_SIZE / (gmax - gmin) if gmax > gmin else 0.0)
+        thr_idx = int(threshold * LUT_SIZE)
+        return lut, np.float32(gmin), scale, thr_idx, self.zero_clip(param_name)
+
+    def colorize_grid_batch(
         self,
         model: str,
         param_name: str,
-        data_2d: np.ndarray,
+        data_3d: np.ndarray,
         gmin: float,
         gmax: float,
-        missing_mask: np.ndarray | None = None
+        missing_mask: np.ndarray | None = None,
+        reuse_output: bool = False
     ) -> np.ndarray:
         """
-        Returns an (H,W,4) RGBA uint8 array.
-        We'll do a binary alpha cutoff for near-zero data => alpha=0.
+        Colorize a (T,H,W) stack of frames sharing one param/range in one kernel
+        call. Returns a (T,H,W,4) RGBA uint8 array (see colorize_grid for
+        reuse_output).
         """
-        if missing_mask is None:
-            missing_mask = np.isnan(data_2d)
-
-        tmp_data = data_2d.copy()
-        tmp_data[missing_mask] = gmin
-
-        norm = Normalize(vmin=gmin, vmax=gmax)
-
-        cmap_name_or_obj = self.assign_color_map(model, param_name)
-        if isinstance(cmap_name_or_obj, LinearSegmentedColormap):
-            cmap_obj = cmap_name_or_obj
+        lut, _, scale, thr_idx, zero_clip = self.colorize_params(model, param_name, gmin, gmax)
+        out_shape = data_3d.shape + (4,)
+        if reuse_output:
+            rgba_8u = self._get_buffer(out_shape, np.uint8)
         else:
-            cmap_obj = plt.get_cmap(cmap_name_or_obj)
-
-        # 1) Convert data => normalized => colormap => float RGBA => then 8-bit
-        normed_data = norm(tmp_data)            # shape (H,W), in [0..1]
-        rgba_float = cmap_obj(normed_data)      # shape (H,W,4), float in [0..1]
-        rgba_8u = (rgba_float * 255).astype(np.uint8)
-
-        # 2) Hard alpha cutoff near zero => no partial alpha
-        #    For example, below 0.02 => alpha=0, else alpha=255
-        if self.zero_clip(param_name):
-            threshold = 0.02
-            is_below = (normed_data < threshold)
-            rgba_8u[is_below, 3] = 0
-            rgba_8u[~is_below, 3] = 255
-
-        # 3) Missing data => alpha=0
-        rgba_8u[missing_mask, 3] = 0
-
+            rgba_8u = np.empty(out_shape, dtype=np.uint8)
+        # No mask => NaN check inside the kernel; the placeholder is never read
+        use_mask = missing_mask is not None
+        _colorize_kernel(
+            data_3d, missing_mask if use_mask else _NO_MASK, use_mask,
+            lut, np.float32(gmin), scale, thr_idx, zero_clip, rgba_8u
+        )
         return rgba_8u
 
     def select_first_last_every_nth(self, arr: List[Any], n: int) -> List[Any]:
@@ -317,7 +262,8 @@ class MapColors:
             return []
         if len(arr) <= 2:
             return arr
-        return [arr[0]] + arr[1:-1:n] + [arr[-1]]
+        last = len(arr) - 1
+        return [arr[i] for i in chain((0,), range(1, last, n), (last,))]
 
     def _rgba_to_hex(self, rgba: List[int], keep_alpha: bool = False) -> str:
         """
@@ -351,9 +297,11 @@ class MapColors:
             model, param_name, num_colors
         )
 
-        # 2) Convert each row => hex
-        color_rows = color_array_8bit.tolist()
-        hex_colors = [self._rgba_to_hex(row, keep_alpha=keep_alpha) for row in color_rows]
+        # 2) Convert each row => hex (one bytes.hex() call, then fixed-width slices)
+        channels = 4 if keep_alpha else 3
+        step = 2 * channels
+        hexstr = np.ascontiguousarray(color_array_8bit[:, :channels]).tobytes().hex().upper()
+        hex_colors = ["#" + hexstr[k:k + step] for k in range(0, len(hexstr), step)]
 
         # 3) Possibly condense
         condensed_list = self.select_first_last_every_nth(hex_colors, condensed)
@@ -1,12 +1,21 @@
+import contextlib
+import functools
+import glob
+import hashlib
+import heapq
 import threading
-from threading import Timer, Lock
+import time
+import weakref
+from threading import Lock
 import pygrib
 from pyproj import Transformer
 import logging
 import os
 import re
-import json
+import struct
+import sys
 import math
+import msgpack
 import numpy as np
 import pickle
 from datetime import datetime, timezone, timedelta
@@ -14,15 +23,15 @@ from typing import Any, Tuple, Dict, Optional, Union, List, Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from scipy.spatial import Delaunay
 # Replace these imports with your own local modules:
-from .parameter_meta import apply_parameter_meta
+from .parameter_meta import apply_parameter_meta, apply_gfs_meta, warmup as warmup_parameter_meta
 from .caching.cache import ICacheBackend, CACHE_TTL
 from .caching.local_cache import LocalStorage
 from .threads import ConcurrencyService
 from .map_colors import MapColors
 from .time_logger import TimeLogger
-from .interpolator import Interpolator
+from .interpolator import Interpolator, GridInterpolator, box_decimate, prune_cache_dir
 from .system_config import SystemConfig
-from .fast_interpolation import fast_interpolate
+from .fast_interpolation import fast_interpolate, interp_grid
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 # Global dictionary for preloaded GRIB file data.
@@ -32,19 +41,261 @@ logger = logging.getLogger(__name__)
 
 
 DEBOUNCE_INTERVAL = 0.3  # debounce period in seconds
+DEBOUNCE_MAX_PENDING = 64  # flush early once this many keys are waiting
+GRIB_INDEX_KEYS = ("name", "typeOfLevel", "level", "stepType")
+# Header keys that pin down a message's lat/lon grid, so messages on the same
+# grid share one decoded lat/lon file.
+GRID_KEYS = (
+    "gridType", "Ni", "Nj",
+    "latitudeOfFirstGridPointInDegrees", "longitudeOfFirstGridPointInDegrees",
+    "latitudeOfLastGridPointInDegrees", "longitudeOfLastGridPointInDegrees",
+)
+DIR_LISTING_TTL = 60.0  # seconds a GRIB run folder listing is trusted
+PARAM_MAP_LOCAL_TTL = 60  # seconds a param map is reused in-process before re-reading the cache
+KNOWN_BLANK_TTL = 60 * 60  # seconds a tile that rendered blank is answered without rendering
+DECODED_LOCAL_TTL = 10  # seconds a decoded cache value is reused in-process without re-reading the backend
+STALE_GRACE = CACHE_TTL  # seconds past its TTL a value is still served while it refreshes
+# Decoded-GRIB and triangulation cache files unused for this long are deleted;
+# it outlasts the downloader's 5-day retention, so live runs keep theirs.
+TRI_CACHE_MAX_AGE = int(os.getenv("TRI_CACHE_MAX_AGE", 6 * 24 * 3600))
+TRI_CACHE_PRUNE_INTERVAL = 60 * 60  # seconds between prune sweeps per process
+DEBOUNCE_STRIPES = 32  # power of two; pending writes are spread over this many locks
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+def _is_json_like(obj: Any) -> bool:
+    """dict/list trees of str keys and plain scalars (no tuples, arrays, datetimes)."""
+    if isinstance(obj, _JSON_SCALARS):
+        return True
+    if type(obj) is dict:
+        return all(isinstance(k, str) and _is_json_like(v) for k, v in obj.items())
+    if type(obj) is list:
+        return all(_is_json_like(v) for v in obj)
+    return False
+
+def _is_grid_entry(obj: Any) -> bool:
+    """(data, lat_1d, lon_1d, meta) point-forecast value entry with plain numeric arrays."""
+    return (
+        type(obj) is tuple and len(obj) == 4
+        and all(type(a) is np.ndarray and a.dtype.kind in "fiub" for a in obj[:3])
+        and type(obj[3]) is dict and _is_json_like(obj[3])
+    )
+
+def _is_grid_dict(obj: Any) -> bool:
+    return (
+        type(obj) is dict and bool(obj)
+        and all(isinstance(k, str) and (v is None or _is_grid_entry(v)) for k, v in obj.items())
+    )
+
+def _pack_grids(entries: Dict[str, Optional[Tuple[Any, ...]]], single: bool) -> bytes:
+    """
+    b"G" + 4-byte header length + MessagePack header + the raw array frames
+    back to back. The header lists each frame's shape/dtype once, and every
+    entry refers to its data/lat/lon frames by index, so parameters on the
+    same grid share a single copy of the lat/lon axes. Decoding is
+    np.frombuffer over the payload: no object graph to rebuild, no copies.
+    """
+    header: Dict[str, Any] = {"single": single, "frames": [], "entries": {}}
+    chunks: List[bytes] = []
+    frame_ids: Dict[Tuple[Any, ...], int] = {}
+
+    def frame(a: np.ndarray) -> int:
+        a = np.ascontiguousarray(a)
+        raw = a.tobytes()
+        ident = (a.shape, a.dtype.str, raw)
+        idx = frame_ids.get(ident)
+        if idx is None:
+            idx = frame_ids[ident] = len(chunks)
+            header["frames"].append([list(a.shape), a.dtype.str])
+            chunks.append(raw)
+        return idx
+
+    for key, entry in entries.items():
+        if entry is None:
+            header["entries"][key] = None
+            continue
+        # the data grid is never shared; only axes are worth deduplicating
+        data_idx = len(chunks)
+        header["frames"].append([list(entry[0].shape), entry[0].dtype.str])
+        chunks.append(np.ascontiguousarray(entry[0]).tobytes())
+        header["entries"][key] = [entry[3], [data_idx, frame(entry[1]), frame(entry[2])]]
+    packed = msgpack.packb(header, use_bin_type=True)
+    return b"".join([b"G", len(packed).to_bytes(4, "little"), packed, *chunks])
+
+def _unpack_grids(data: bytes) -> Any:
+    view = memoryview(data)
+    size = int.from_bytes(view[1:5], "little")
+    header = msgpack.unpackb(view[5:5 + size], raw=False)
+    offset = 5 + size
+
+    def read(shape: List[int], dtype_str: str) -> np.ndarray:
+        nonlocal offset
+        dtype = np.dtype(dtype_str)
+        count = int(np.prod(shape))
+        arr = np.frombuffer(view, dtype=dtype, count=count, offset=offset).reshape(shape)
+        offset += count * dtype.itemsize
+        return arr
+
+    frames = [read(shape, dtype_str) for shape, dtype_str in header["frames"]]
+    entries: Dict[str, Optional[Tuple[Any, ...]]] = {}
+    for key, spec in header["entries"].items():
+        if spec is None:
+            entries[key] = None
+            continue
+        meta, frame_ids = spec
+        entries[key] = (*(frames[i] for i in frame_ids), meta)
+    if header["single"]:
+        return next(iter(entries.values()))
+    return entries
+
+def _encode(obj: Any) -> bytes:
+    """
+    Cache payload: b"J" + MessagePack for plain JSON-like values (param maps,
+    parameter definitions, min/max), b"G" raw array frames for point-forecast
+    grids (see _pack_grids), b"P" + pickle 5 for everything else.
+    """
+    if _is_json_like(obj):
+        return b"J" + msgpack.packb(obj, use_bin_type=True)
+    if _is_grid_entry(obj):
+        return _pack_grids({"": obj}, single=True)
+    if _is_grid_dict(obj):
+        return _pack_grids(obj, single=False)
+    return b"P" + pickle.dumps(obj, protocol=5)
+
+def _decode(data: bytes) -> Any:
+    tag = data[:1]
+    if tag == b"J":
+        return msgpack.unpackb(data[1:], raw=False)
+    if tag == b"G":
+        return _unpack_grids(data)
+    if tag == b"P":
+        return pickle.loads(data[1:])
+    raise ValueError(f"unknown cache payload tag {bytes(tag)!r}")
+
+def _axis_cell(axis: np.ndarray, x: float, period: Optional[float] = None) -> Tuple[int, int, float]:
+    """
+    (i, i_next, frac) of the cell of an ascending axis that brackets x. The
+    index comes straight from the mean spacing and is only searched for when
+    the axis isn't uniform. With a period, x wraps and the last cell closes
+    back onto index 0; otherwise x clamps to the ends.
+    """
+    n = len(axis)
+    first, last = float(axis[0]), float(axis[-1])
+    if period is not None:
+        x = first + (x - first) % period
+        if x > last:
+            return n - 1, 0, (x - last) / (first + period - last)
+    if x <= first:
+        return 0, 1, 0.0
+    if x >= last:
+        return n - 2, n - 1, 1.0
+    i = min(int((x - first) / ((last - first) / (n - 1))), n - 2)
+    if not axis[i] <= x <= axis[i + 1]:
+        i = min(max(int(np.searchsorted(axis, x)) - 1, 0), n - 2)
+    lo, hi = float(axis[i]), float(axis[i + 1])
+    return i, i + 1, (x - lo) / (hi - lo)
+
+@functools.lru_cache(maxsize=256)
+def _todays_hour_with_date(offset: int, minute_bucket: int) -> str:
+    now = datetime.fromtimestamp(minute_bucket * 60, timezone.utc)
+    if now.minute >= 30:
+        now += timedelta(hours=1)
+    adjusted_time = now + timedelta(hours=offset)
+    return f"{adjusted_time.day:02}:{adjusted_time.hour:02}"
+
+@functools.lru_cache(maxsize=1024)
+def _version_tag(source_version: Optional[str]) -> str:
+    """Short key-safe token for a grib_file_version() ("none" without a file)."""
+    if source_version is None:
+        return "none"
+    return hashlib.blake2b(source_version.encode(), digest_size=6).hexdigest()
+
+# One translate() pass for ASCII names: "/" -> "_", " " -> "-", uppercase ->
+# lowercase, and every other character outside [\w\s-] dropped.
+_PARAM_KEY_TABLE = {
+    c: (None if not re.match(r"[\w\s_-]", chr(c)) else chr(c).lower())
+    for c in range(128)
+}
+_PARAM_KEY_TABLE[ord("/")] = "_"
+_PARAM_KEY_TABLE[ord(" ")] = "-"
+
+@functools.lru_cache(maxsize=4096)
+def _param_key(raw_name: str) -> str:
+    # Interned, so metadata lookups against parameter_meta's (interned) keys
+    # compare by identity.
+    if raw_name.isascii():
+        return sys.intern(raw_name.translate(_PARAM_KEY_TABLE))
+    pk = re.sub(r"[^\w\s_-]", "", raw_name.replace("/", "_"))
+    return sys.intern(pk.lower().replace(" ", "-"))
 
 class InterpolatorCachingService:
     def __init__(self, cache_backend: ICacheBackend):
         self.cache = cache_backend
         self.local_cache = LocalStorage()
-        self.debounce_lock = Lock()
-        # Maps key -> (latest_interpolator, timer)
-        self.debounce_map = {}
+        # Pending key -> (latest interpolator, flush deadline), striped by
+        # hash(key) so threads updating different keys don't contend.
+        self._stripes: List[Tuple[Lock, Dict[str, Tuple[Interpolator, float]]]] = [
+            (Lock(), {}) for _ in range(DEBOUNCE_STRIPES)
+        ]
+        # One (deadline, key) entry per pending key; a single flusher thread
+        # sleeps on the condition until the earliest deadline comes due.
+        self._deadline_heap: List[Tuple[float, str]] = []
+        self._heap_cv = threading.Condition(Lock())
+        self._flush_all = False
+        # Pickling megabyte-sized interpolators happens here, never on a tile thread
+        self._ser_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="interp-ser")
+        # interpolator -> {key: monotonic time it was last written to / read from
+        # the global cache}. Weak keys, so entries drop out with the interpolator.
+        self._global_written: "weakref.WeakKeyDictionary[Any, Dict[str, float]]" = weakref.WeakKeyDictionary()
+        self._written_lock = Lock()
+        self._flusher = threading.Thread(target=self._flusher_loop, name="interp-flush", daemon=True)
+        self._flusher.start()
+        # Threads don't survive fork(): a worker forked from a preloaded app
+        # (gunicorn --preload) inherits this object without its flusher.
+        def restart_in_child(ref=weakref.WeakMethod(self._after_fork)):
+            after_fork = ref()
+            if after_fork is not None:
+                after_fork()
+        os.register_at_fork(after_in_child=restart_in_child)
+
+    def _after_fork(self) -> None:
+        """Fresh locks, serializer pool and flusher thread for a forked child."""
+        self._stripes = [(Lock(), pending) for _, pending in self._stripes]
+        self._heap_cv = threading.Condition(Lock())
+        self._written_lock = Lock()
+        self._ser_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="interp-ser")
+        self._flusher = threading.Thread(target=self._flusher_loop, name="interp-flush", daemon=True)
+        self._flusher.start()
+
+    def _pickle_frames(self, inter: Interpolator) -> List[Any]:
+        """
+        Pickle protocol 5 with NumPy arrays passed out-of-band: the header holds
+        the object graph, each array buffer becomes its own frame, so the big
+        Delaunay/value arrays are never concatenated into one pickle stream.
+        Frames are not kept: _in_global already stops repeat writes, and a
+        retained copy would double each cached interpolator's memory.
+        """
+        buffers: List[pickle.PickleBuffer] = []
+        header = pickle.dumps(inter, protocol=5, buffer_callback=buffers.append)
+        return [header] + [buf.raw() for buf in buffers]
+
+    def _mark_global(self, key: str, inter: Interpolator) -> None:
+        with self._written_lock:
+            self._global_written.setdefault(inter, {})[key] = time.monotonic()
+
+    def _in_global(self, key: str, inter: Interpolator) -> bool:
+        """
+        True if this exact interpolator is already in the global cache under key
+        and the entry is young enough (half of CACHE_TTL) not to need a refresh.
+        """
+        written = self._global_written.get(inter)
+        at = written.get(key) if written else None
+        return at is not None and time.monotonic() - at < CACHE_TTL / 2
 
     def _untangle_pickle(self, cached: Any) -> Optional[Interpolator]:
-        if cached is not None:
+        if isinstance(cached, (list, tuple)) and cached:
             try:
-                return pickle.loads(cached)
+                return pickle.loads(cached[0], buffers=cached[1:])
             except Exception as e:
                 logger.error(f"Error unpickling cache key : {e}")
         return None
@@ -56,35 +307,101 @@ class InterpolatorCachingService:
         inter = self.cache.get(key) or None
         if inter:
             inter = self._untangle_pickle(inter)
+            if inter is None:
+                return None
             self.local_cache.set(key, inter)
+            # It came from the global cache, so there's nothing to write back.
+            self._mark_global(key, inter)
             return inter
         return  None
 
     def set_global_cache_val(self, key: str, inter: Interpolator, expire = CACHE_TTL) -> None:
         # Write the value to the global cache (e.g., Redis)
-        self.cache.set(key, pickle.dumps(inter, protocol=4), expire=expire)
+        self.cache.set(key, self._pickle_frames(inter), expire=expire)
+        self._mark_global(key, inter)
 
-    def _debounce_callback(self, key: str) -> None:
-        """Called when the debounce timer expires for a key."""
-        with self.debounce_lock:
-            # Retrieve the latest value for the key and remove its timer.
-            value, _ = self.debounce_map.pop(key, (None, None))
-        if value is not None:
-            self.set_global_cache_val(key, value)
+    def _write_batch(self, pending: Dict[str, Interpolator]) -> None:
+        try:
+            # One pickle per interpolator, even when it is pending under several keys
+            frames_by_id: Dict[int, List[Any]] = {}
+            for inter in pending.values():
+                if id(inter) not in frames_by_id:
+                    frames_by_id[id(inter)] = self._pickle_frames(inter)
+            self.cache.mset(
+                {key: frames_by_id[id(inter)] for key, inter in pending.items()},
+                expire=CACHE_TTL,
+            )
+            for key, inter in pending.items():
+                self._mark_global(key, inter)
+        except Exception as e:
+            logger.error(f"Error writing interpolators to global cache: {e}")
+
+    def _debounce_callback(self, keys: List[str]) -> None:
+        """Write the given pending keys (their latest interpolators) in one batch."""
+        pending: Dict[str, Interpolator] = {}
+        for key in keys:
+            lock, stripe = self._stripe(key)
+            with lock:
+                entry = stripe.pop(key, None)
+            if entry is not None:
+                pending[key] = entry[0]
+        if pending:
+            self._ser_pool.submit(self._write_batch, pending)
+
+    def _flusher_loop(self) -> None:
+        while True:
+            with self._heap_cv:
+                while True:
+                    if self._flush_all:
+                        due = [key for _, key in self._deadline_heap]
+                        self._deadline_heap.clear()
+                        self._flush_all = False
+                        break
+                    if not self._deadline_heap:
+                        self._heap_cv.wait()
+                        continue
+                    delay = self._deadline_heap[0][0] - time.monotonic()
+                    if delay > 0:
+                        self._heap_cv.wait(delay)
+                        continue
+                    now = time.monotonic()
+                    due = []
+                    while self._deadline_heap and self._deadline_heap[0][0] <= now:
+                        due.append(heapq.heappop(self._deadline_heap)[1])
+                    break
+            try:
+                self._debounce_callback(due)
+            except Exception as e:
+                logger.error(f"Error flushing pending interpolators: {e}")
 
     def set_interpolator(self, key: str, inter: Interpolator) -> None:
         # Always update the local (level 2) cache immediately.
         self.local_cache.set(key, inter)
-        # Debounce the global cache update.
-        with self.debounce_lock:
-            # If a timer already exists for this key, cancel it.
-            if key in self.debounce_map:
-                _, timer = self.debounce_map[key]
-                timer.cancel()
-            # Create a new timer that will call _debounce_callback after the interval.
-            timer = Timer(DEBOUNCE_INTERVAL, self._debounce_callback, args=(key,))
-            self.debounce_map[key] = (inter, timer)
-            timer.start()
+        # Tile renders hand back the same interpolator again and again; only
+        # new (or aging) key/interpolator pairs go to the global cache.
+        if self._in_global(key, inter):
+            return
+        # Debounce the global cache update: the latest value per key is written
+        # DEBOUNCE_INTERVAL after the key first became pending, or right away
+        # once DEBOUNCE_MAX_PENDING keys are queued.
+        lock, stripe = self._stripe(key)
+        with lock:
+            entry = stripe.get(key)
+            deadline = entry[1] if entry is not None else time.monotonic() + DEBOUNCE_INTERVAL
+            stripe[key] = (inter, deadline)
+        if entry is not None:
+            return  # already scheduled; the flusher picks up the new value
+        with self._heap_cv:
+            heapq.heappush(self._deadline_heap, (deadline, key))
+            if len(self._deadline_heap) >= DEBOUNCE_MAX_PENDING:
+                self._flush_all = True
+                self._heap_cv.notify()
+            elif self._deadline_heap[0][1] == key:
+                # New earliest deadline: wake the flusher to shorten its sleep.
+                self._heap_cv.notify()
+
+    def _stripe(self, key: str) -> Tuple[Lock, Dict[str, Tuple[Interpolator, float]]]:
+        return self._stripes[hash(key) & (DEBOUNCE_STRIPES - 1)]
 
 
 class ModelService:
@@ -103,7 +420,12 @@ class ModelService:
         self.config = SystemConfig()
         self.cache = cache_backend
         self.concurrency = ConcurrencyService()
-        self.key_locks: Dict[str, threading.Lock] = {}
+        # key -> [lock, holders + waiters]; an entry lives only while in use
+        self.key_locks: Dict[str, List[Any]] = {}
+        self._key_locks_guard = threading.Lock()
+        # keys whose stale value is being recomputed in the background
+        self._refreshing: set = set()
+        self._refreshing_lock = threading.Lock()
         self.metadata_cache: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
         self.decimation = self.config.get_decimation()
         self.MODEL_MAP = self.config.get_model_map()
@@ -111,29 +433,56 @@ class ModelService:
         self.RUN_HOURS = [0, 6, 12, 18]
         self.transformer = Transformer.from_crs("epsg:4326", "epsg:3857", always_xy=True)
         self.colors = MapColors()
-        self.interpolator = Interpolator(self.transformer)
+        self.interpolator = Interpolator(self.transformer, self.config.tri_cache_path())
         self.interpolator_cache = InterpolatorCachingService(cache_backend)
+        # Shared by point-forecast requests; the work is cache/disk I/O plus
+        # short NumPy calls, so it is sized past the core count.
+        self._interp_pool = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 4) * 2), thread_name_prefix="gfs-interp"
+        )
+        # GRIB path -> (mtime, {name: [(messagenumber, name, typeOfLevel, level, stepType), ...]})
+        self._grib_index: Dict[str, Tuple[float, Dict[str, List[Tuple[Any, ...]]]]] = {}
+        # param_map cache key -> param map, so per-offset loops don't each hit the cache backend
+        self._param_maps = LocalStorage(max_entries=64)
+        # cache key -> (decoded value, soft deadline); dropped on our own _cache_set
+        self._decoded = LocalStorage(max_entries=256)
+        # "<interpolator key>:<z>:<x>:<y>" of tiles that rendered blank; the key
+        # pins the valid hour, so a new forecast hour starts over
+        self._known_blank = LocalStorage(max_entries=200_000)
+        warmup_parameter_meta()
+        # (date_str, run_str) -> (monotonic timestamp, folder listing)
+        self._dir_listing: Dict[Tuple[str, str], Tuple[float, frozenset]] = {}
+        # monotonic time of this process's last sweep of the triangulation cache dir
+        self._tri_cache_pruned_at = -math.inf
 
         # self._preload_all_grib_data()
-    def get_or_build_tile_grid(self, ip, pts: np.ndarray, tile_key: str, oversize: int = 257) -> Optional[np.ndarray]:
+    def get_or_build_tile_grid(
+        self,
+        ip,
+        pts: Optional[np.ndarray],
+        tile_key: str,
+        oversize: int = 257,
+        axes: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> Optional[np.ndarray]:
         """
         If the tile grid for tile_key is not yet computed, one thread computes it
         (by calling ip(pts) in one go) while other threads wait.
         Once computed, the grid is cached and returned.
+        With axes=(xs, ys) instead of pts, regular grids interpolate on the
+        axes directly and the point array is only built for other interpolators.
         """
         try:
             timer = TimeLogger()
             timer.log("Start 1")
-            # # return None
-            tri: Delaunay = ip.tri  # ip.tri is the Delaunay object used by LinearNDInterpolator
-            # Compute the simplex indices for each query point.
-            simplex_indices = tri.find_simplex(pts)
-            # Get the transformation matrix and the simplices.
-            transform = tri.transform  # shape: (nsimplex, ndim+1, ndim)
-            simplices = tri.simplices   # shape: (nsimplex, ndim+1)
-            vertex_values = ip.values.ravel()  # Data values as a 1D array
-            f_grid = fast_interpolate(transform, simplices, vertex_values, pts, simplex_indices)
-            grid = f_grid.reshape((oversize, oversize))
+            if isinstance(ip, GridInterpolator):
+                # Regular grids are interpolated directly, no triangulation.
+                grid = ip.grid(*axes) if axes is not None else ip(pts).reshape((oversize, oversize))
+                self.interpolator_cache.set_interpolator(tile_key, ip)
+                timer.log("END 1")
+                return grid
+            if pts is None:
+                pts = self.config.pts_from_axes(*axes)
+            grid = self._interpolate_tile(ip, pts, oversize)
             # self._cache_set(tile_key, ip)
             self.interpolator_cache.set_interpolator(tile_key, ip)
             timer.log("END 1")
@@ -141,60 +490,88 @@ class ModelService:
         except Exception as e:
             logger.error(f"Faile to interpolate key file {tile_key}: {e}", exc_info=True)
             return None
+    def _tri_arrays(self, ip) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (transform, simplices, flat_values) for a Delaunay-backed interpolator,
+        attached to ip once so per-tile calls skip the attribute materialization.
+        Values are kept as a C-contiguous float32 copy (half the bandwidth into
+        the kernels; plenty for rendering). Interpolators restored from an
+        older cache entry get them on first use.
+        """
+        if getattr(ip, "_flat_values", None) is None:
+            ip._tri_transform = np.ascontiguousarray(ip.tri.transform)  # (nsimplex, ndim+1, ndim)
+            ip._tri_simplices = np.ascontiguousarray(ip.tri.simplices)  # (nsimplex, ndim+1)
+            ip._tri_neighbors = np.ascontiguousarray(ip.tri.neighbors)  # (nsimplex, ndim+1)
+            ip._flat_values = np.ascontiguousarray(ip.values, dtype=np.float32).ravel()  # data values as 1D
+        return ip._tri_transform, ip._tri_simplices, ip._flat_values
+
+    def _interpolate_tile(self, ip, pts: np.ndarray, oversize: int) -> np.ndarray:
+        """
+        (oversize, oversize) grid from a Delaunay-backed interpolator. 2-D tiles go
+        through the fused interp_grid kernel; anything it can't settle (and
+        non-2-D input) uses tri.find_simplex + fast_interpolate.
+        """
+        tri: Delaunay = ip.tri  # ip.tri is the Delaunay object used by LinearNDInterpolator
+        transform, simplices, vertex_values = self._tri_arrays(ip)
+        neighbors = getattr(ip, "_tri_neighbors", None)
+        if pts.shape[1] != 2 or neighbors is None:
+            simplex_indices = tri.find_simplex(pts)
+            return fast_interpolate(transform, simplices, vertex_values, pts, simplex_indices).reshape((oversize, oversize))
+        # One find_simplex per row start seeds the per-row walks.
+        row_seeds = tri.find_simplex(pts[::oversize]).astype(np.int64)
+        grid = np.empty((oversize, oversize), dtype=np.float64)
+        failed = np.empty(len(pts), dtype=np.bool_)
+        interp_grid(transform, simplices, neighbors, vertex_values, pts, row_seeds, grid, failed)
+        if failed.any():
+            redo = pts[failed]
+            grid.ravel()[failed] = fast_interpolate(transform, simplices, vertex_values, redo, tri.find_simplex(redo))
+        return grid
+
     # ---------------------------------------------------------
     # Unified Interpolation Methods (unchanged)
     # ---------------------------------------------------------
-    def interpolate_value(
+    def _cell_corners(
+        self,
+        lat_1d: np.ndarray,
+        lon_1d: np.ndarray,
+        lat: float,
+        lon: float
+    ) -> Tuple[int, int, int, int, float, float]:
+        """
+        (i0, i1, j0, j1, a, b): corner rows/cols of the cell enclosing
+        (lat, lon) and the fractional position inside it (a along lon, b along
+        lat). Indices come from the axis spacing in O(1) (see _axis_cell).
+        """
+        n_lon = len(lon_1d)
+        dlon = (float(lon_1d[-1]) - float(lon_1d[0])) / (n_lon - 1)
+        period = 360.0 if abs(dlon * n_lon - 360.0) < abs(dlon) * 1e-3 else None
+        i0, i1, b = _axis_cell(lat_1d, lat)
+        j0, j1, a = _axis_cell(lon_1d, lon, period)
+        return i0, i1, j0, j1, a, b
+
+    def _bilinear_cell(
         self,
-        data: np.ndarray,
-        lats: np.ndarray,
-        lons: np.ndarray,
-        target_lat: float,
-        target_lon: float
-    ) -> float:
-        wrapped_lon = self._wrap_lon_0_360(target_lon)
-        rc_list = self.find_nearest_grid_indices(lats, lons, target_lat, wrapped_lon, k=4)
-        return self.bilinear_from_indices(lats, lons, data, rc_list, target_lat, wrapped_lon)
+        lat_1d: np.ndarray,
+        lon_1d: np.ndarray,
+        lat: float,
+        lon: float
+    ) -> Tuple[Tuple[int, ...], Tuple[int, ...], np.ndarray]:
+        """
+        (rows, cols, weights) of the 4 corners of the cell enclosing (lat, lon),
+        so any number of value arrays on the same grid can share one lookup.
+        """
+        i0, i1, j0, j1, a, b = self._cell_corners(lat_1d, lon_1d, lat, lon)
+        weights = np.array([(1 - a) * (1 - b), a * (1 - b), (1 - a) * b, a * b])
+        return (i0, i0, i1, i1), (j0, j1, j0, j1), weights
+
+    def _grid_axes(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if lats.ndim == 2:
+            return lats[:, 0], lons[0, :]
+        return lats, lons
 
     def _wrap_lon_0_360(self, lon: float) -> float:
         return lon + 360.0 if lon < 0 else lon
 
-    def find_nearest_grid_indices(
-        self,
-        lat_array: np.ndarray,
-        lon_array: np.ndarray,
-        target_lat: float,
-        target_lon: float,
-        k: int = 4
-    ) -> List[Tuple[int, int]]:
-        rows, cols = lat_array.shape
-        flat_lats = lat_array.ravel()
-        flat_lons = lon_array.ravel()
-        d2 = (flat_lats - target_lat) ** 2 + (flat_lons - target_lon) ** 2
-        idx_sorted = np.argsort(d2)[:k]
-        return [(idx // cols, idx % cols) for idx in idx_sorted]
-
-    def bilinear_from_indices(
-        self,
-        lat_array: np.ndarray,
-        lon_array: np.ndarray,
-        data_array: np.ndarray,
-        rc_list: List[Tuple[int, int]],
-        target_lat: float,
-        target_lon: float
-    ) -> float:
-        weights, vals = [], []
-        for r, c in rc_list:
-            latv, lonv, datv = lat_array[r, c], lon_array[r, c], data_array[r, c]
-            dist = math.sqrt((latv - target_lat) ** 2 + (lonv - target_lon) ** 2)
-            w = 1.0 / (dist + 1e-9)
-            weights.append(w)
-            vals.append(datv)
-        total_w = sum(weights)
-        if total_w < 1e-14:
-            return float(vals[0])
-        return float(sum(v * w for v, w in zip(vals, weights)) / total_w)
-
     def _build_valid_datetime_from_metadata(self, meta: Dict[str, Any], fallback_offset: int) -> datetime:
         data_date = meta.get("dataDate")
         data_time = meta.get("dataTime", 0)
@@ -229,13 +606,8 @@ class ModelService:
     def process_hour_offset(self, hour_offset: int) -> int:
         if hour_offset <= 120:
             return hour_offset
-        delta = hour_offset - 120
-        change = delta % 3
-        if change == 0:
-            return hour_offset
-        elif change == 1:
-            return hour_offset - 1
-        return hour_offset + 1
+        # Past f120 GFS output is 3-hourly: snap to the nearest multiple of 3 from 120.
+        return 120 + 3 * ((hour_offset - 119) // 3)
 
     def find_date_run_fhr(self, model: str, hour_offset: int,
                           max_lookback=5, max_forward=1) -> Tuple[Optional[str], Optional[str], Optional[int]]:
@@ -259,13 +631,29 @@ class ModelService:
                 date_str = rd.strftime("%Y%m%d")
                 run_str = f"{rd.hour:02d}"
                 f_str = f"f{fhr:03d}"
-                folder = os.path.join(self.GRIB_FILES_PATH, date_str, run_str)
                 fname = f"{prefix}.t{run_str}z.{category}.{resolution}.{f_str}{appendix}"
-                path = os.path.join(folder, fname)
-                if os.path.exists(path):
+                if fname in self._listdir(date_str, run_str):
                     return date_str, run_str, fhr
         return None, None, None
 
+    def _listdir(self, date_str: str, run_str: str) -> frozenset:
+        """
+        Cached listing of a GRIB run folder: one listdir per folder instead of
+        a stat per candidate file. Listings expire after DIR_LISTING_TTL so
+        freshly downloaded files show up.
+        """
+        key = (date_str, run_str)
+        now = time.monotonic()
+        cached = self._dir_listing.get(key)
+        if cached is not None and now - cached[0] < DIR_LISTING_TTL:
+            return cached[1]
+        try:
+            listing = frozenset(os.listdir(os.path.join(self.GRIB_FILES_PATH, date_str, run_str)))
+        except (FileNotFoundError, NotADirectoryError):
+            listing = frozenset()
+        self._dir_listing[key] = (now, listing)
+        return listing
+
     def get_grib_file(self, model: str, hour_offset: int) -> Optional[str]:
         d, r, fhr = self.find_date_run_fhr(model, hour_offset)
         if not d:
@@ -277,6 +665,20 @@ class ModelService:
         if os.path.exists(fullpath):
             return fullpath
         return None
+
+    def grib_file_version(self, model: str, hour_offset: int) -> Optional[str]:
+        """
+        "<path>:<mtime_ns>" of the GRIB file behind (model, hour_offset), or
+        None if there is none. It changes whenever a newer run (or a fresh
+        download) replaces the data for that valid hour.
+        """
+        fp = self.get_grib_file(model, hour_offset)
+        if not fp:
+            return None
+        try:
+            return f"{fp}:{os.stat(fp).st_mtime_ns}"
+        except OSError:
+            return None
     # -------------------------------------------------------------------------
     # Building Param Map
     # -------------------------------------------------------------------------
@@ -288,13 +690,18 @@ class ModelService:
                 return {}
             try:
                 with pygrib.open(fp) as grbs: # type: ignore
-                    plist = {grb.name for grb in grbs}
-                pm = {re.sub(r"[^\w\s_-]", "", p.replace("/", "_")).lower().replace(" ", "-"): p for p in plist}
+                    plist = set(self._grib_index_for(grbs) or ()) or {grb.name for grb in grbs}
+                pm = {_param_key(p): p for p in plist}
                 return pm
             except Exception as e:
                 logger.error(f"Error building param map for {model}, {hour_offset}: {e}")
                 return {}
-        return self._get_or_compute(cache_key, compute)
+        pm = self._param_maps.get(cache_key)
+        if pm is None:
+            pm = self._get_or_compute(cache_key, compute)
+            if pm:
+                self._param_maps.set(cache_key, pm, expire=PARAM_MAP_LOCAL_TTL)
+        return pm
 
     def flip_latitudes(self, ckey: Tuple[Any, ...], g: Any) -> bool:
         """
@@ -325,8 +732,23 @@ class ModelService:
         hour_offset: int,
         level: Optional[int] = None,
         level_type: Optional[str] = None,
-        step_type:  Optional[str] = None):
-        return f"interp:{model}:{param_key}:{self.todays_hour_with_date(hour_offset)}:{level}:{level_type}:{step_type}"
+        step_type:  Optional[str] = None,
+        source_version: Optional[str] = None):
+        """
+        The key ends with the source GRIB version (see grib_file_version, which
+        is looked up when not passed), so a newer run never reuses an
+        interpolator built from the file it replaced.
+        """
+        if source_version is None:
+            source_version = self.grib_file_version(model, hour_offset)
+        return (f"interp:{model}:{param_key}:{self.todays_hour_with_date(hour_offset)}:{level}:{level_type}:{step_type}:"
+                f"{_version_tag(source_version)}")
+
+    def is_known_blank(self, interp_key: str, z: int, x: int, y: int) -> bool:
+        return self._known_blank.get(f"{interp_key}:{z}:{x}:{y}") is not None
+
+    def mark_known_blank(self, interp_key: str, z: int, x: int, y: int) -> None:
+        self._known_blank.set(f"{interp_key}:{z}:{x}:{y}", True, KNOWN_BLANK_TTL)
 
     def get_or_build_interpolator(
         self,
@@ -336,11 +758,12 @@ class ModelService:
         level: Optional[int] = None,
         level_type: Optional[str] = None,
         step_type: Optional[str] = None,
+        source_version: Optional[str] = None,
     ) -> Optional[Any]:
         """
         Build or retrieve from cache a global Interpolator for tile rendering.
         """
-        cache_key = self.get_interpolator_cache_key(model, param_key, hour_offset, level, level_type, step_type)
+        cache_key = self.get_interpolator_cache_key(model, param_key, hour_offset, level, level_type, step_type, source_version)
         def compute():
             fp = self.get_grib_file(model, hour_offset)
             if not fp:
@@ -354,10 +777,15 @@ class ModelService:
                     g = self._select_grib_message(grbs, param_name, level, level_type, step_type)
                     if not g:
                         return None
-                    data = g.values
-                    lats, lons = g.latlons()
-                    lat_flip = self.flip_latitudes(self.build_interpolator_key(model, param_key, hour_offset, level, level_type, step_type), g)
-                    ip = self.interpolator.build_interpolator(data, lats, lons, lat_flip=lat_flip, decimation=self.decimation)
+                    data, lats, lons = self._decoded_message(grbs, g)
+                    # Bake the scan-direction handling in once: negate for
+                    # jScansPositively=0, then store rows with ascending lats.
+                    if self.flip_latitudes(self.build_interpolator_key(model, param_key, hour_offset, level, level_type, step_type), g):
+                        lats = -lats
+                    if lats[0, 0] > lats[-1, 0]:
+                        data, lats, lons = data[::-1], lats[::-1], lons[::-1]
+                    data, lats, lons = (np.ascontiguousarray(a) for a in (data, lats, lons))
+                    ip = self.interpolator.build_interpolator(data, lats, lons, decimation=self.decimation)
                     # meta = self._extract_grib_metadata(g)
                     gmin = float(getattr(g, "minimum", 0.0))
                     gmax = float(getattr(g, "maximum", 1.0))
@@ -366,6 +794,8 @@ class ModelService:
                                                                    step_type if step_type is not None else 'instant',
                                                                    gmin, gmax)
                     ip.missing_val = float(getattr(g, "missingValue", 9999.0))
+                    if not isinstance(ip, GridInterpolator):
+                        self._tri_arrays(ip)
                     # Cache both the interpolator and its metadata together.
                     ip(self.config.get_global_pts_boundaries())
                     return ip
@@ -375,8 +805,143 @@ class ModelService:
         interpolator_cache = self.interpolator_cache.get_interpolator(cache_key)
         if interpolator_cache:
             return interpolator_cache
-        return self._get_or_compute(cache_key, compute)
+        # The interpolator cache owns this key and its pickle-5 frame format, so
+        # the build is stored through it, not through _get_or_compute's writer.
+        with self._key_lock(cache_key):
+            ip = self.interpolator_cache.get_interpolator(cache_key)
+            if ip is None:
+                ip = compute()
+                if ip is not None:
+                    self.interpolator_cache.set_interpolator(cache_key, ip)
+            return ip
+
+
+    def _grib_index_for(self, grbs: Any) -> Optional[Dict[str, List[Tuple[Any, ...]]]]:
+        """
+        Per-file index of message headers grouped by parameter name, built in
+        one pass on first use and reused until the file's mtime changes. None
+        if the file can't be stat'ed.
+        """
+        path = getattr(grbs, "name", None)
+        if not path:
+            return None
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        cached = self._grib_index.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        grbs.seek(0)
+        by_name: Dict[str, List[Tuple[Any, ...]]] = {}
+        for grb in grbs:
+            entry = (grb.messagenumber,) + tuple(getattr(grb, k, None) for k in GRIB_INDEX_KEYS)
+            by_name.setdefault(entry[1], []).append(entry)
+        grbs.seek(0)
+        self._grib_index[path] = (mtime, by_name)
+        return by_name
+
+    def _decoded_message(self, grbs: Any, g: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (values, lats, lons) for a GRIB message. The first decode of each file
+        version is saved as .npy under the triangulation cache dir; later calls,
+        from this or any sibling worker process, memory-map those read-only, so
+        the pages are shared through the OS page cache instead of every worker
+        decoding its own copy. Masked values keep their mask.
+        """
+        cache_dir = self.config.tri_cache_path()
+        path = getattr(grbs, "name", None)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns if path and cache_dir else None
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is None:
+            return (g.values, *g.latlons())
+
+        file_tag = hashlib.blake2b(os.path.abspath(path).encode(), digest_size=8).hexdigest()
+        grid = tuple(getattr(g, k, None) for k in GRID_KEYS)
+        if grid[0] is None:
+            grid += (g.messagenumber,)
+        grid_tag = hashlib.blake2b(repr(grid).encode(), digest_size=8).hexdigest()
+        base = os.path.join(cache_dir, f"grid_{file_tag}_{mtime_ns}")
+        data_path = f"{base}_msg{g.messagenumber}.npy"
+        mask_path = f"{base}_msg{g.messagenumber}.mask.npy"
+        latlon_path = f"{base}_latlon_{grid_tag}.npy"
+        try:
+            data = np.asarray(np.load(data_path, mmap_mode="r"))
+            latlon = np.asarray(np.load(latlon_path, mmap_mode="r"))
+            if os.path.exists(mask_path):
+                data = np.ma.MaskedArray(data, mask=np.load(mask_path))
+            # still in use: keep them out of the age-based prune
+            with contextlib.suppress(OSError):
+                os.utime(data_path)
+                os.utime(latlon_path)
+            return data, latlon[0], latlon[1]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable decoded GRIB cache {base}: {e}")
 
+        values = g.values
+        lats, lons = g.latlons()
+        self._prune_tri_cache(cache_dir)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            if not os.path.exists(latlon_path):
+                # First message of this file version: drop older versions' arrays.
+                for stale in glob.glob(os.path.join(cache_dir, f"grid_{file_tag}_*.npy")):
+                    if not stale.startswith(f"{base}_"):
+                        try:
+                            os.remove(stale)
+                        except OSError:
+                            pass
+                self._save_npy(latlon_path, np.stack((lats, lons)))
+            if np.ma.isMaskedArray(values):
+                self._save_npy(mask_path, np.ma.getmaskarray(values))
+            self._save_npy(data_path, np.ma.getdata(values))
+        except OSError as e:
+            logger.warning(f"Could not write decoded GRIB cache {base}: {e}")
+        return values, lats, lons
+
+    def _prune_tri_cache(self, cache_dir: str) -> None:
+        """
+        At most once per TRI_CACHE_PRUNE_INTERVAL, drop decoded-GRIB arrays
+        and triangulations nobody has used for TRI_CACHE_MAX_AGE. Versions of
+        a file are replaced as it changes, but files of deleted runs are only
+        cleared here.
+        """
+        now = time.monotonic()
+        if now - self._tri_cache_pruned_at < TRI_CACHE_PRUNE_INTERVAL:
+            return
+        self._tri_cache_pruned_at = now
+        prune_cache_dir(cache_dir, TRI_CACHE_MAX_AGE)
+
+    def _save_npy(self, path: str, arr: np.ndarray) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp_path, path)
+
+    def _grib_select(self, grbs: Any, **criteria: Any) -> List[Any]:
+        """
+        grbs.select(**criteria) answered from the header index: only matching
+        messages are read, via grbs.message(n). Like pygrib, raises ValueError
+        when nothing matches. Criteria outside GRIB_INDEX_KEYS use grbs.select.
+        """
+        index = self._grib_index_for(grbs)
+        if index is None or not criteria.keys() <= set(GRIB_INDEX_KEYS):
+            return grbs.select(**criteria)
+        if "name" in criteria:
+            # the name picks the bucket; only its few messages are compared
+            entries = index.get(criteria["name"], [])
+        else:
+            entries = [entry for bucket in index.values() for entry in bucket]
+            entries.sort()
+        want = [(i, criteria[k]) for i, k in enumerate(GRIB_INDEX_KEYS, start=1) if k in criteria and k != "name"]
+        hits = [entry[0] for entry in entries if all(entry[i] == v for i, v in want)]
+        if not hits:
+            raise ValueError("no matches found")
+        return [grbs.message(n) for n in hits]
 
     def _select_grib_message(
         self,
@@ -396,7 +961,7 @@ class ModelService:
 
         # if level is not None and type_of_level is not None:
         try:
-            sel = grbs.select(**search)
+            sel = self._grib_select(grbs, **search)
             if len(sel) == 1:
                 logger.debug(f"[Exact match] param={param_name}, level={level}, typeOfLevel={type_of_level}")
                 return sel[0]
@@ -493,7 +1058,7 @@ class ModelService:
 
         for i in range(2):
             try:
-                found = grbs.select(**select)
+                found = self._grib_select(grbs, **select)
                 if found:
                     logger.info(f"Found surface data (level=0) for param={param_name}")
                     return found[0]
@@ -507,7 +1072,7 @@ class ModelService:
             return None
         try:
             # two meter above ground
-            found = grbs.select(name=param_name, typeOfLevel="heightAboveGround", level=2, stepType=step_type)
+            found = self._grib_select(grbs, name=param_name, typeOfLevel="heightAboveGround", level=2, stepType=step_type)
             if found:
                 logger.info("Found data (level=2) for param=heightAboveGround" )
                 return found[0]
@@ -519,7 +1084,7 @@ class ModelService:
         near_surface_levels = [1000, 975, 950, 925, 900, 850]
         for lvl in near_surface_levels:
             try:
-                found = grbs.select(name=param_name, typeOfLevel="isobaricInhPa", level=lvl)
+                found = self._grib_select(grbs, name=param_name, typeOfLevel="isobaricInhPa", level=lvl)
                 if found:
                     logger.info(f"Found isobaric near-surface data (lvl={lvl}) for param={param_name}")
                     return self.fetch_instant(found)
@@ -529,7 +1094,7 @@ class ModelService:
 
     def search_param_only_and_find_surface(self, grbs: Any, param_name: str):
         try:
-            found = grbs.select(name=param_name)
+            found = self._grib_select(grbs, name=param_name)
             if found:
                 f = self.fetch_near_surface_fallback(found)
                 send = f if f else found[0]
@@ -594,27 +1159,39 @@ class ModelService:
     def parameter_definitions(self, offset: int = 0) -> List[Dict[str, Any]]:
         param_def_key = f"param_key_definitions:{self.todays_hour_with_date(offset)}"
         def compute():
-            results: List[Dict[str, Any]] = []
-            for model_key in self.MODEL_MAP:
-                fp = self.get_grib_file(model_key, offset)
-                if not fp or not os.path.exists(fp):
-                    results.append({"model": model_key, "params": []})
-                    continue
-                try:
-                    param_list = self.parse_grib_parameters(fp, model_key)
-                    results.append({"model": model_key, "params": param_list})
-                except Exception as ex:
-                    logger.error(f"Error reading {fp}: {ex}")
-                    results.append({"model": model_key, "params": []})
-            return results
+            # Each model's GRIB file is read on its own worker; results keep
+            # MODEL_MAP order.
+            futs = [self.concurrency.submit(self._param_def_one, m, offset) for m in self.MODEL_MAP]
+            return [f.result() for f in futs]
         return self._get_or_compute(param_def_key, compute)
 
+    def _param_def_one(self, model_key: str, offset: int) -> Dict[str, Any]:
+        fp = self.get_grib_file(model_key, offset)
+        if not fp or not os.path.exists(fp):
+            return {"model": model_key, "params": []}
+        try:
+            return {"model": model_key, "params": self.parse_grib_parameters(fp, model_key)}
+        except Exception as ex:
+            logger.error(f"Error reading {fp}: {ex}")
+            return {"model": model_key, "params": []}
+
     def parse_grib_parameters(self, fp: str, model_key: str) -> List[Dict[str, Any]]:
-        local_levels = self.build_local_levels(fp)
+        # Levels and per-parameter info are gathered in the same walk over the
+        # file; each info entry holds its name's levels dict, which keeps
+        # filling in as later messages are read.
+        local_levels: Dict[str, Dict[str, Dict[ str, List[int|str]]]] = {}
         local_info: Dict[str, Any] = {}
         with pygrib.open(fp) as grbs:  # type: ignore
             for grb in grbs:
                 nm = grb.name
+                tof = grb.typeOfLevel
+                levels = local_levels.setdefault(nm, {})
+                if tof not in levels:
+                    levels[tof] = {"level": [], "stepType": []}
+                levels[tof]["level"].append(grb.level)
+                st = grb.stepType
+                if st not in levels[tof]["stepType"]:
+                    levels[tof]["stepType"].append(st)
                 if nm in local_info:
                     continue
 
@@ -632,26 +1209,21 @@ class ModelService:
                         "min": getattr(grb, "minimum", "N/A"),
                         "max": getattr(grb, "maximum", "N/A"),
                     },
-                    "levels": local_levels.get(nm, {})
+                    "levels": levels
                 }
                 local_info[nm] = self.apply_parameter_meta(pk, p_info, model_key)
         return list(local_info.values())
 
     def make_param_key(self, raw_name: str) -> str:
-        pk = raw_name.replace("/", "_")
-        pk = re.sub(r"[^\w\s_-]", "", pk)
-        return pk.lower().replace(" ", "-")
+        return _param_key(raw_name)
 
     def todays_hour(self, offset: int = 0) -> int:
         now = datetime.now()
         return (now + timedelta(hours=offset)).hour
 
     def todays_hour_with_date(self, offset: int = 0) -> str:
-        now = datetime.utcnow()
-        if now.minute >= 30:
-            now += timedelta(hours=1)
-        adjusted_time = now + timedelta(hours=offset)
-        return f"{adjusted_time.day:02}:{adjusted_time.hour:02}"
+        # Only the current minute matters, so the string is memoized per minute.
+        return _todays_hour_with_date(offset, int(time.time()) // 60)
 
     def create_tile_cache_key(
         self,
@@ -661,12 +1233,21 @@ class ModelService:
         hour_offset: int,
         z: int, x: int, y: int,
         level_arg: Optional[int],
-        step_type: Optional[str] = None
+        step_type: Optional[str] = None,
+        source_version: Optional[str] = None
     ) -> str:
+        """
+        Like get_interpolator_cache_key, the key ends with the source GRIB
+        version, so PNGs rendered from a replaced run are never served for
+        the newer one.
+        """
+        if source_version is None:
+            source_version = self.grib_file_version(model, hour_offset)
         return (f"tile:{model}:{param_key}:{self.todays_hour_with_date(hour_offset)}:"
                 f"{z}:{x}:{y}:{level_arg if user_tof is not None else 0}:"
                 f"{user_tof if user_tof else 'surface'}:"
-                f"{step_type if step_type else 'instant'}")
+                f"{step_type if step_type else 'instant'}:"
+                f"{_version_tag(source_version)}")
 
 
     def get_key_string(self, param_val: str|Dict[str, Any]) -> str:
@@ -714,39 +1295,6 @@ class ModelService:
                 })
         return missing_params
 
-    def pull_worker_map_values(
-        self,
-        model: str,
-        lat: float,
-        lon: float,
-        hour_offset: int,
-        level: Optional[int] = None,
-        type_of_level: Optional[str] = None,
-        step_type: Optional[str] = None):
-        def map_values(search_item: Any, values_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-            try:
-                local_level = level
-                local_type_of_level = type_of_level
-                local_step_type = step_type
-                if not isinstance(search_item, str):
-                    local_level = search_item.get("level", level)
-                    local_type_of_level = search_item.get("typeOfLevel", type_of_level)
-                    local_step_type = search_item.get("stepType", step_type)
-                param_name = self.get_key_string(search_item)
-                param_key = self.build_level_params(param_name, local_level, local_type_of_level, local_step_type)
-                result = values_dict.get(param_key)
-                if result is None:
-                    raise ValueError(f"No cached values for {param_key}")
-                data_array, lat_array, lon_array, meta_dict = result
-                val = self.interpolate_value(data_array, lat_array, lon_array, lat, lon)
-                return {"value": float(val), "units": meta_dict.get("parameterUnits", "unknown"), "metadata": meta_dict}
-
-            except Exception as exc:
-                logger.warning(f"Error getting forecast for {search_item}: {exc}")
-                return None
-        return map_values
-
-
     def iterate_multiple_keys_against_geo_point(
         self,
         model: str,
@@ -768,20 +1316,64 @@ class ModelService:
             type_of_level,
             step_type
         )
-        map_values = self.pull_worker_map_values(model, lat, lon, hour_offset, level, type_of_level,step_type)
-        def worker(search_item: Any) -> Optional[Dict[str, Any]]:
-            return map_values(search_item, values_dict)
+        return self._point_values(values_dict, search_parameters, lat, lon, level, type_of_level, step_type)
 
-        results = []
-        max_workers = os.cpu_count() or 4
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_map = {executor.submit(worker, sp): sp for sp in search_parameters}
-            for future in as_completed(future_map):
-                try:
-                    results.append(future.result())
-                except Exception as exc:
-                    logger.warning(f"Thread error for search item: {exc}")
-                    results.append(None)
+    def _point_values(
+        self,
+        values_dict: Dict[str, Any],
+        search_parameters: List[Any],
+        lat: float,
+        lon: float,
+        level: Optional[int] = None,
+        type_of_level: Optional[str] = None,
+        step_type: Optional[str] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Values at (lat, lon) for every search parameter, in order (None where
+        there is no cached entry). Parameters on the same grid share one cell
+        lookup; their 4 corner values are gathered into one (n, 4) array and
+        weighted with a single matrix-vector product.
+        """
+        wrapped_lon = self._wrap_lon_0_360(lon)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(search_parameters)
+        # grid signature -> [(result slot, values entry), ...]
+        groups: Dict[Tuple[Any, ...], List[Tuple[int, Tuple[Any, ...]]]] = {}
+        get_key_string = self.get_key_string
+        build_level_params = self.build_level_params
+        grid_axes = self._grid_axes
+        for slot, search_item in enumerate(search_parameters):
+            if isinstance(search_item, str):
+                param_key = build_level_params(search_item, level, type_of_level, step_type)
+            else:
+                item_get = search_item.get
+                param_key = build_level_params(
+                    get_key_string(search_item),
+                    item_get("level", level),
+                    item_get("typeOfLevel", type_of_level),
+                    item_get("stepType", step_type),
+                )
+            try:
+                entry = values_dict[param_key]
+            except KeyError:
+                entry = None
+            if entry is None:
+                logger.warning(f"Error getting forecast for {search_item}: No cached values for {param_key}")
+                continue
+            lat_1d, lon_1d = grid_axes(entry[1], entry[2])
+            grid = (entry[0].shape, float(lat_1d[0]), float(lat_1d[-1]), float(lon_1d[0]), float(lon_1d[-1]))
+            groups.setdefault(grid, []).append((slot, entry))
+
+        for members in groups.values():
+            lat_1d, lon_1d = self._grid_axes(members[0][1][1], members[0][1][2])
+            try:
+                rows, cols, weights = self._bilinear_cell(lat_1d, lon_1d, lat, wrapped_lon)
+                values = np.array([entry[0][rows, cols] for _, entry in members]) @ weights
+            except Exception as exc:
+                logger.warning(f"Error getting forecast values: {exc}")
+                continue
+            for (slot, entry), val in zip(members, values):
+                meta_dict = entry[3]
+                results[slot] = {"value": float(val), "units": meta_dict.get("parameterUnits", "unknown"), "metadata": meta_dict}
         return results
 
 # from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -806,7 +1398,7 @@ class ModelService:
         callback: Optional[Callable[[int, int], None]] = None
     ) -> List[Dict[str, Any]]:
         """
-        Build a forecast timeseries and call the callback each time all futures for an offset are resolved.
+        Build a forecast timeseries and call the callback each time an offset is resolved.
         The callback is called with (completed_offsets, total_offsets).
         """
         # Normalize param_keys to a list
@@ -815,43 +1407,72 @@ class ModelService:
 
         offsets = list(range(start_hour_offset, start_hour_offset + total_days * 24 + 1, step_hours))
         total_offsets = len(offsets)
-        # For each offset, we expect one future per param_key.
-        outstanding = {off: len(param_keys) for off in offsets}
         completed_offsets = 0
 
+        def offset_values(off: int) -> List[Optional[Dict[str, Any]]]:
+            # Cache build and interpolation for one offset run together on a
+            # worker, so offsets proceed in parallel end to end.
+            values_dict = self._get_or_build_value_cache_dictionary(
+                model, param_keys, lat, lon, off, level, type_of_level, step_type
+            )
+            return self._point_values(values_dict, param_keys, lat, lon, level, type_of_level, step_type)
+
         results = []
-        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
-            future_map = {}
-            for off in offsets:
-                values_dict = self._get_or_build_value_cache_dictionary(
-                    model, param_keys, lat, lon, off, level, type_of_level, step_type
-                )
-                map_values = self.pull_worker_map_values(model, lat, lon, off, level, type_of_level, step_type)
-                for pk in param_keys:
-                    fut = executor.submit(map_values, pk, values_dict)
-                    future_map[fut] = (off, self.get_key_string(pk))
-            for fut in as_completed(future_map):
-                off, local_param_key = future_map[fut]
+
+        def collect(off: int, point_values: List[Optional[Dict[str, Any]]]) -> None:
+            nonlocal completed_offsets
+            for pk, res in zip(param_keys, point_values):
+                if not res:
+                    continue
+                local_param_key = self.get_key_string(pk)
                 try:
-                    res = fut.result()
-                    if res:
-                        results.append({
-                            "offset": off,
-                            "param_key": local_param_key,
-                            "value": res["value"],
-                            "units": res["units"],
-                            "metadata": res["metadata"],
-                            "datetime": self._build_valid_datetime_from_metadata(res["metadata"], off).isoformat()
-                        })
+                    results.append({
+                        "offset": off,
+                        "param_key": local_param_key,
+                        "value": res["value"],
+                        "units": res["units"],
+                        "metadata": res["metadata"],
+                        "datetime": self._build_valid_datetime_from_metadata(res["metadata"], off).isoformat()
+                    })
                 except Exception as e:
                     logger.error(f"Error processing offset {off} for param {local_param_key}: {e}")
-                # Decrement the count for this offset.
-                outstanding[off] -= 1
-                if outstanding[off] == 0:
-                    completed_offsets += 1
-                    if callback:
-                        callback(completed_offsets, total_offsets)
-        # Group results by parameter key.
+            completed_offsets += 1
+            if callback:
+                callback(completed_offsets, total_offsets)
+
+        # One round-trip for every offset's value dictionary. Offsets that
+        # already hold all requested params are answered inline; only the
+        # rest go to the pool to build their caches.
+        dict_keys = [self._get_grib_dict_values_key(model, off) for off in offsets]
+        memos = [self._decoded.get(key) for key in dict_keys]
+        unread = [key for key, memo in zip(dict_keys, memos) if memo is None]
+        try:
+            blobs = dict(zip(unread, self.cache.mget(unread)))
+        except Exception as e:
+            logger.error(f"Error reading value dictionaries: {e}")
+            blobs = {}
+        cold_offsets = []
+        for off, key, memo in zip(offsets, dict_keys, memos):
+            values_dict = memo[0] if memo is not None else self._decode_entry(key, blobs.get(key))[0]
+            if values_dict and not self.get_all_missing_key_strings(param_keys, values_dict, level, type_of_level, step_type):
+                collect(off, self._point_values(values_dict, param_keys, lat, lon, level, type_of_level, step_type))
+            else:
+                cold_offsets.append(off)
+        # Cold offsets each open their GRIB; start every read now so offsets
+        # queued behind a busy pool find their file already in page cache.
+        self._prefetch_grib_files(model, cold_offsets)
+        future_map = {self._interp_pool.submit(offset_values, off): off for off in cold_offsets}
+        for fut in as_completed(future_map):
+            off = future_map[fut]
+            try:
+                point_values = fut.result()
+            except Exception as e:
+                logger.error(f"Error processing offset {off}: {e}")
+                point_values = []
+            collect(off, point_values)
+        # Group results by parameter key, in offset order (valid time grows
+        # with the offset, so no datetime parsing is needed to order them).
+        results.sort(key=lambda r: r["offset"])
         final_results = {}
         for r in results:
             pk = r["param_key"]
@@ -861,11 +1482,6 @@ class ModelService:
                 "datetime": r["datetime"],
                 "value": r["value"]
             })
-        for res in final_results.values():
-            res["values"] = sorted(
-                res["values"],
-                key=lambda x: datetime.fromisoformat(x["datetime"])
-            )
         final_list = list(final_results.values())
         return final_list
 
@@ -904,7 +1520,8 @@ class ModelService:
         step_type: Optional[str] = None,
     ):
         cache_key = self._get_grib_dict_values_key(model, hour_offset)
-        values = self._cache_get(cache_key) or {}
+        # Copied: the decoded dict is shared with other readers of this key.
+        values = dict(self._cache_get(cache_key) or {})
         param_keys = self.get_all_missing_key_strings(search_parameters, values, level, type_of_level, step_type)
         if len(param_keys) == 0:
             return values
@@ -953,22 +1570,37 @@ class ModelService:
                 if not g:
                     logger.warning(f"No suitable GRIB message found for {param_name}")
                     return None
-                data_array = g.values
-                lat_array, lon_array = g.latlons()
+                data_array, lat_array, lon_array = self._decoded_message(grbs, g)
                 if getattr(g, "jScansPositively", None) == 0:
                     data_array = np.flipud(data_array)
                     lat_array = np.flipud(lat_array)
                     lon_array = np.flipud(lon_array)
-                # Apply decimation.
+                # Apply decimation: box-filtered data, strided coordinates.
                 if self.decimation > 1:
-                    data_array = data_array[::self.decimation, ::self.decimation]
+                    lon_axis = lon_array[0, :]
+                    dlon = abs(float(lon_axis[-1]) - float(lon_axis[0])) / max(len(lon_axis) - 1, 1)
+                    periodic = dlon > 0 and abs(dlon * len(lon_axis) - 360.0) < dlon * 1e-3
+                    data_array = box_decimate(data_array, self.decimation, periodic)
                     lat_array = lat_array[::self.decimation, ::self.decimation]
                     lon_array = lon_array[::self.decimation, ::self.decimation]
-                return (data_array, lat_array, lon_array, self._extract_grib_metadata(g))
+                # Regular grid: keep only the 1-D axes, rows in ascending latitude.
+                # float32 throughout: GRIB packing is coarser than that, and it
+                # halves what the cache stores and the lookups read.
+                lat_1d, lon_1d = lat_array[:, 0], lon_array[0, :]
+                if lat_1d[0] > lat_1d[-1]:
+                    data_array, lat_1d = data_array[::-1], lat_1d[::-1]
+                return (
+                    np.ascontiguousarray(data_array, dtype=np.float32),
+                    np.ascontiguousarray(lat_1d, dtype=np.float32),
+                    np.ascontiguousarray(lon_1d, dtype=np.float32),
+                    self._extract_grib_metadata(g),
+                )
             except Exception as e:
                 logger.error(f"Error building interpolator: {e}", exc_info=True)
                 return None
-        return self._get_or_compute(cache_key, compute)
+        # compute reads from the caller's open grbs, so it can't run later in
+        # the background: a stale entry is recomputed right here instead.
+        return self._get_or_compute(cache_key, compute, stale_ok=False)
 
 
     def _get_raw_grib(self, model: str, hour_offset: int,
@@ -983,6 +1615,27 @@ class ModelService:
             logger.error(f"Error reading GRIB file {fp}: {exc}", exc_info=True)
             return None
 
+    def _prefetch_grib_files(self, model: str, hour_offsets: List[int]) -> None:
+        """
+        Ask the kernel to read the GRIB files for these offsets ahead
+        (POSIX_FADV_WILLNEED). It returns immediately; the reads overlap with
+        whatever the caller does next. A no-op where fadvise isn't available.
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+        for off in hour_offsets:
+            fp = self.get_grib_file(model, off)
+            if not fp:
+                continue
+            try:
+                fd = os.open(fp, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            except OSError as exc:
+                logger.debug(f"GRIB prefetch skipped for {fp}: {exc}")
+
     # -------------------------------------------------------------------------
     # Multi-Day Forecast Timeseries
     # -------------------------------------------------------------------------
@@ -1008,50 +1661,127 @@ class ModelService:
         new_max: float
     ) -> Tuple[float, float]:
         cache_key = f"max:min:{model}:{param_key}:{level}:{type_of_level}:{step_type}"
-        cached = self.cache.get(cache_key)
-        if cached:
-            try:
-                current_min, current_max = json.loads(cached)
+
+        def widen(cached: Optional[Any]) -> bytes:
+            updated_min, updated_max = new_min, new_max
+            # 16 raw bytes: two little-endian float64
+            if isinstance(cached, bytes) and len(cached) == 16:
+                current_min, current_max = struct.unpack("<dd", cached)
                 updated_min = min(current_min, new_min)
                 updated_max = max(current_max, new_max)
-            except (json.JSONDecodeError, TypeError, ValueError):
-                updated_min, updated_max = new_min, new_max
-        else:
-            updated_min, updated_max = new_min, new_max
-        self.cache.set(cache_key, json.dumps((updated_min, updated_max)))
-        return updated_min, updated_max
+            return struct.pack("<dd", updated_min, updated_max)
+
+        # Atomic read-modify-write, so concurrent builds can't drop each
+        # other's widening.
+        return struct.unpack("<dd", self.cache.update(cache_key, widen))
 
     def apply_parameter_meta(self, param_key: str, p_info: dict, model_key: str) -> dict:
+        if model_key == "gfs":
+            return apply_gfs_meta(param_key, p_info)
         return apply_parameter_meta(param_key, p_info, model_key)
 
     # --- Caching Helper Methods ---
+    def _cache_get_entry(self, key: str) -> Tuple[Optional[Any], bool]:
+        """
+        (value, fresh). Values are written with a soft deadline ahead of the
+        payload (b"S" + float64 epoch seconds); past it the value is stale but
+        still usable until the backend drops it STALE_GRACE seconds later.
+        Decoded values are kept in-process for DECODED_LOCAL_TTL seconds, so
+        repeated reads of one key skip the backend and the decode.
+        """
+        memo = self._decoded.get(key)
+        if memo is not None:
+            return memo[0], time.time() < memo[1]
+        return self._decode_entry(key, self.cache.get(key))
+
+    def _decode_entry(self, key: str, cached: Optional[bytes]) -> Tuple[Optional[Any], bool]:
+        if cached is None:
+            return None, False
+        try:
+            if cached[:1] != b"S":
+                raise ValueError("missing soft deadline")
+            (soft_deadline,) = struct.unpack_from("<d", cached, 1)
+            value = _decode(memoryview(cached)[9:])
+        except Exception as e:
+            logger.error(f"Error unpickling cache key {key}: {e}")
+            return None, False
+        if value is not None:
+            self._decoded.set(key, (value, soft_deadline), expire=DECODED_LOCAL_TTL)
+        return value, time.time() < soft_deadline
+
     def _cache_get(self, key: str) -> Optional[Any]:
-        cached = self.cache.get(key)
-        if cached is not None:
-            try:
-                return pickle.loads(cached)
-            except Exception as e:
-                logger.error(f"Error unpickling cache key {key}: {e}")
-        return None
+        return self._cache_get_entry(key)[0]
 
     def _cache_set(self, key: str, value: Any, expire: int = CACHE_TTL) -> None:
+        self._decoded.delete(key)
         try:
-            self.cache.set(key, pickle.dumps(value, protocol=4), expire=expire)
+            payload = b"S" + struct.pack("<d", time.time() + expire) + _encode(value)
+            self.cache.set(key, payload, expire=expire + STALE_GRACE)
         except Exception as e:
             logger.error(f"Error setting cache key {key}: {e}")
 
-    def _get_or_compute(self, key: str, compute_fn: Callable[[], Any], expire: int = CACHE_TTL) -> Any:
-        """Return value from cache or compute it (with per‑resource locking) and cache it."""
-        cached = self._cache_get(key)
-        if cached is not None:
+    def _get_or_compute(
+        self, key: str, compute_fn: Callable[[], Any], expire: int = CACHE_TTL, stale_ok: bool = True
+    ) -> Any:
+        """
+        Return value from cache or compute it (with per‑resource locking) and cache it.
+        A stale value is returned as is while compute_fn refreshes it on the
+        interpolation pool (stale-while-revalidate); callers only block when
+        there is no value at all, or when stale_ok is False.
+        """
+        cached, fresh = self._cache_get_entry(key)
+        if cached is not None and (fresh or stale_ok):
+            if not fresh:
+                self._refresh_in_background(key, compute_fn, expire)
             return cached
-        lock = self.key_locks.setdefault(key, threading.Lock())
-        with lock:
+        with self._key_lock(key):
             # Check again in case another thread computed while waiting
-            cached = self._cache_get(key)
-            if cached is not None:
+            cached, fresh = self._cache_get_entry(key)
+            if cached is not None and fresh:
                 return cached
             result = compute_fn()
             if result is not None:
                 self._cache_set(key, result, expire)
             return result
+
+    @contextlib.contextmanager
+    def _key_lock(self, key: str):
+        """
+        Per-key lock, reference counted so the table only holds keys that are
+        being computed right now (no unbounded growth, no throwaway Lock per
+        call). Distinct keys never share a lock, so nested computes (e.g. an
+        interpolator build reading the param map) can't deadlock on a collision.
+        """
+        with self._key_locks_guard:
+            entry = self.key_locks.get(key)
+            if entry is None:
+                entry = self.key_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._key_locks_guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self.key_locks[key]
+
+    def _refresh_in_background(self, key: str, compute_fn: Callable[[], Any], expire: int) -> None:
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                with self._key_lock(key):
+                    result = compute_fn()
+                    if result is not None:
+                        self._cache_set(key, result, expire)
+            except Exception as e:
+                logger.error(f"Error refreshing cache key {key}: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        self._interp_pool.submit(refresh)
@@ -1,12 +1,23 @@
+import functools
 import numpy as np
 from typing import Dict
 import os
+
+@functools.lru_cache(maxsize=64)
+def _axis_template(tile_width: float, oversize: int) -> np.ndarray:
+    # linspace(0, tile_width, oversize): every tile at one zoom shares it,
+    # only the offset differs. Read-only, since the cached array is shared.
+    template = np.linspace(0.0, tile_width, oversize)
+    template.flags.writeable = False
+    return template
+
 class SystemConfig:
     def __init__(self):
         self.WEB_MERCATOR_CONSTANT = 20037508.342789244
         self.TILE_SIZE = 256
         self.decimation = 2
         self.GRIB_FILES_PATH =  os.getenv("GRIB_FILES_PATH", "/Users/guernica0131/Sites/foreshadow-api/grib")
+        self.TRI_CACHE_PATH = os.getenv("TRI_CACHE_PATH", os.path.join(self.GRIB_FILES_PATH, ".tri_cache"))
 
         self.MODEL_MAP = {
             "gfs": {
@@ -24,6 +35,8 @@ class SystemConfig:
         }
     def file_path(self):
         return self.GRIB_FILES_PATH
+    def tri_cache_path(self):
+        return self.TRI_CACHE_PATH
     def get_model_map(self) -> Dict[str, Dict[str, str]]:
         return self.MODEL_MAP
     def get_decimation(self):
@@ -42,24 +55,51 @@ class SystemConfig:
         return self.TILE_SIZE + 1
     def apply_oversize(self, oversize: int = 265):
         return oversize + 1
-    def get_tile_pts_boundaries(self, z: int, x: int, y: int, oversize = 256):
+    def get_tile_axes(self, z: int, x: int, y: int, oversize = 256):
+        """
+        The tile's x (columns) and y (rows) Web Mercator axes; the tile's
+        points are their outer product, so consumers that can broadcast
+        never need the (oversize², 2) array.
+        """
         tile_count = 2 ** z
         tile_width = (self.get_web_mercator_x_max() - self.get_web_mercator_x_min()) / tile_count
         tile_min_x = self.get_web_mercator_x_min() + x * tile_width
-        tile_max_x = tile_min_x + tile_width
         tile_min_y = self.get_web_mercator_y_min() + y * tile_width
-        tile_max_y = tile_min_y + tile_width
-        gx, gy = np.meshgrid(
-            np.linspace(tile_min_x, tile_max_x, oversize),
-            np.linspace(tile_min_y, tile_max_y, oversize)
-        )
-        return np.column_stack((gx.ravel(), gy.ravel()))
+        template = _axis_template(tile_width, oversize)
+        return template + tile_min_x, template + tile_min_y
+    def get_tile_bbox(self, z: int, x: int, y: int):
+        """
+        Web Mercator (min_x, min_y, max_x, max_y) of the tile, in the same
+        orientation get_tile_axes uses.
+        """
+        tile_width = (self.get_web_mercator_x_max() - self.get_web_mercator_x_min()) / 2 ** z
+        tile_min_x = self.get_web_mercator_x_min() + x * tile_width
+        tile_min_y = self.get_web_mercator_y_min() + y * tile_width
+        return tile_min_x, tile_min_y, tile_min_x + tile_width, tile_min_y + tile_width
+    def tile_intersects_domain(self, z: int, x: int, y: int, domain_bbox) -> bool:
+        """
+        Whether the tile overlaps domain_bbox (min_x, min_y, max_x, max_y).
+        No bbox means the extent is unknown, which counts as overlapping.
+        """
+        if domain_bbox is None:
+            return True
+        min_x, min_y, max_x, max_y = self.get_tile_bbox(z, x, y)
+        d_min_x, d_min_y, d_max_x, d_max_y = domain_bbox
+        return min_x <= d_max_x and d_min_x <= max_x and min_y <= d_max_y and d_min_y <= max_y
+    def pts_from_axes(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        # Row-major (y outer, x inner), as meshgrid + column_stack produced,
+        # filled straight into the one output array.
+        pts = np.empty((ys.size * xs.size, 2), dtype=np.float64)
+        pts[:, 0].reshape(ys.size, xs.size)[:] = xs[None, :]
+        pts[:, 1].reshape(ys.size, xs.size)[:] = ys[:, None]
+        return pts
+    def get_tile_pts_boundaries(self, z: int, x: int, y: int, oversize = 256):
+        return self.pts_from_axes(*self.get_tile_axes(z, x, y, oversize))
     def get_global_pts_boundaries(self, oversize: int = 256) -> np.ndarray:
         """
         Returns a global grid of points covering the entire Web Mercator domain.
         """
-        gx, gy = np.meshgrid(
+        return self.pts_from_axes(
             np.linspace(self.get_web_mercator_x_min(), self.get_web_mercator_x_max(), self.apply_oversize(oversize)),
             np.linspace(self.get_web_mercator_y_min(), self.get_web_mercator_y_max(), self.apply_oversize(oversize))
         )
-        return np.column_stack((gx.ravel(), gy.ravel()))
@@ -3,12 +3,28 @@ from multiprocessing import cpu_count
 
 class ConcurrencyService:
     """
-    Wraps a ThreadPoolExecutor for concurrency tasks.
+    Wraps a ThreadPoolExecutor (default) or ProcessPoolExecutor for concurrency tasks.
+
+    Threads suit what the service submits today: bound ModelService methods
+    doing GRIB I/O, which can't be pickled into another process. On the tile
+    path the serial numba kernels release the GIL (nogil) and the parallel
+    ones already spread over numba's own threads. mode="process" is for pure-Python
+    CPU work on picklable functions; pass an initializer to build per-worker
+    state (e.g. a ModelService) once instead of shipping it with every task.
     """
-    def __init__(self, max_workers=None):
+    def __init__(self, max_workers=None, mode="thread", initializer=None, initargs=()):
         if max_workers is None:
             max_workers = cpu_count()
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        if mode == "process":
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers, initializer=initializer, initargs=initargs
+            )
+        elif mode == "thread":
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, initializer=initializer, initargs=initargs
+            )
+        else:
+            raise ValueError(f"Unknown concurrency mode: {mode}")
 
     def submit(self, fn, *args, **kwargs):
         return self.executor.submit(fn, *args, **kwargs)
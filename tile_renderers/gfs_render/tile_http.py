@@ -0,0 +1,42 @@
+"""
+Tile response helpers shared by the FastAPI (main.py) and Flask
+(gfs_tile_server_flask.py) servers: cache lifetime and headers, ETags and
+the in-process PNG cache in front of Redis.
+"""
+import hashlib
+import logging
+from typing import Dict, Optional
+from .caching.cache import ICacheBackend
+from .caching.local_cache import LocalStorage
+
+logger = logging.getLogger(__name__)
+
+TILE_TTL = 15 * 60
+TILE_HEADERS = {"Cache-Control": f"public, max-age={TILE_TTL}"}
+# Rendered tile PNGs in front of Redis, so hot tiles skip the round-trip
+# (2048 tiles of ~10-60 KB each).
+tile_mem_cache = LocalStorage(max_entries=2048)
+
+
+def tile_etag(cache_key: str) -> str:
+    """
+    Strong ETag for a tile: its cache key pins model, param, valid hour,
+    z/x/y, level and the version of the GRIB file the PNG is rendered from,
+    so a newer run changes both the key and the ETag.
+    """
+    return '"' + hashlib.blake2b(cache_key.encode(), digest_size=12).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return any(tag.strip() in (etag, "W/" + etag) for tag in if_none_match.split(","))
+
+def store_tiles(backend: ICacheBackend, tiles: Dict[str, bytes]) -> None:
+    """
+    Writes rendered tiles to the shared cache. Callers run it off the request
+    path (a background task or a worker thread), so failures are only logged.
+    """
+    try:
+        backend.mset(tiles, TILE_TTL)
+    except Exception as e:
+        logger.error(f"Error writing cache: {e}")
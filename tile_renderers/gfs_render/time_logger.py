@@ -1,5 +1,8 @@
+import logging
 import time
 
+logger = logging.getLogger(__name__)
+
 class TimeLogger:
     def __init__(self, off = False):
         self.off = off
@@ -8,15 +11,15 @@ class TimeLogger:
 
     def log(self, label="Time elapsed"):
         """
-        Prints how many milliseconds have elapsed since this object was created.
-        Optionally pass in a label for clarity.
+        Logs (at DEBUG) how many milliseconds have elapsed since this object
+        was created. Optionally pass in a label for clarity. When the timer is
+        off or DEBUG is disabled, returns before reading the clock.
         """
-        if self.off:
+        if self.off or not logger.isEnabledFor(logging.DEBUG):
             return
 
-        elapsed_seconds = time.perf_counter() - self.start_time
-        elapsed_ms = elapsed_seconds * 1000
-        print(f"{label}: {elapsed_ms:.3f} ms")
+        elapsed_ms = (time.perf_counter() - self.start_time) * 1000
+        logger.debug("%s: %.3f ms", label, elapsed_ms)
 
     def reset(self):
         """
@@ -9,8 +9,8 @@ A streamlined Flask server that:
   2) Implements LRU + time-based pruning to manage memory usage.
   3) Provides a '/prewarm/<model>/<hour_offset>' route to load entire parameter sets
      in advance, avoiding slow first-tiles.
-  4) Detects sentinel 'missingValue' with floating tolerance via np.isclose
-     so e.g. 9998.999 is recognized as missing.
+  4) Detects sentinel 'missingValue' with a ±1 tolerance inside the render
+     kernels, so e.g. 9998.999 is recognized as missing.
   5) Dynamically determines whether to flip latitudes by checking "jScansPositively"
      in each GRIB message (if jScansPositively=0, lat_flip=True).
 
@@ -21,22 +21,39 @@ Routes:
   - /prewarm/<model>/<hour_offset>
 """
 
-import io
 import logging
-from flask import Flask, send_file, abort, jsonify, request
+import orjson
+from typing import Any
+from flask import Flask, Response, abort, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_caching import Cache
 
 # optional parameter metadata merges
 
-from gfs_render import TileRendering, ModelService, RedisCacheBackend
+from gfs_render import ConcurrencyService, TileRendering, ModelService, RedisCacheBackend
+from gfs_render.fast_interpolation import init_numba_threads
+from gfs_render.tile_http import TILE_HEADERS, TILE_TTL, etag_matches, store_tiles, tile_etag, tile_mem_cache
 ##############################################################################
 # Flask Setup
 ##############################################################################
 backend_cache = RedisCacheBackend()
 model_service = ModelService(backend_cache)
+tile_renderer = TileRendering(model_service)
+# Redis writes of freshly rendered tiles, off the response path
+tile_cache_writer = ConcurrencyService(max_workers=4)
+
 from werkzeug.routing import BaseConverter
-from typing import Any
+
+class ORJSONProvider(JSONProvider):
+    """jsonify through orjson; NumPy arrays and scalars serialize as is."""
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 cache_config = {
     "CACHE_TYPE": "RedisCache",
@@ -61,6 +78,13 @@ class SignedIntConverter(BaseConverter):
         """ Convert the integer back to a string when building URLs. """
         return str(value)
 app.url_map.converters['signed_int'] = SignedIntConverter
+
+@app.before_request
+def start_numba_threads():
+    # Flask has no startup hook; after the first request in each process
+    # this returns straight away
+    init_numba_threads()
+
 ##############################################################################
 # Flask Routes
 ##############################################################################
@@ -77,33 +101,41 @@ def serve_tile_route(model, param_key, hour_offset, z, x, y):
     user_tof = request.args.get("typeOfLevel", default=None)
     level_arg = request.args.get("level", type=int, default=None)
     step_type = request.args.get("stepType", type=str, default=None)
-    renderer = TileRendering(model_service)
     if not model_service.valid_model(model):
         return abort(404, "Unknown model.")
-    if not renderer.valid_zxy(z, x, y):
+    if not tile_renderer.valid_zxy(z, x, y):
         return abort(404, "Invalid tile coords.")
 
-    cache_key = model_service.create_tile_cache_key(model, param_key, user_tof, hour_offset, z, x, y, level_arg, step_type)
+    source_version = model_service.grib_file_version(model, hour_offset)
+    cache_key = model_service.create_tile_cache_key(model, param_key, user_tof, hour_offset, z, x, y, level_arg, step_type, source_version)
     print('MY CACHE KEY', cache_key)
+    headers = dict(TILE_HEADERS)
+    # No source file => no ETag: the tile is about to 404 or be rendered fresh
+    if source_version is not None:
+        headers["ETag"] = tile_etag(cache_key)
+        if etag_matches(request.headers.get("If-None-Match"), headers["ETag"]):
+            return Response(status=304, headers=headers)
+    use_mem_cache = "no-cache" not in request.headers.get("Cache-Control", "")
+    if use_mem_cache:
+        cached_tile = tile_mem_cache.get(cache_key)
+        if cached_tile:
+            return Response(cached_tile, mimetype="image/png", headers=headers)
     try:
         cached_tile = backend_cache.get(cache_key)
         if cached_tile:
-            return send_file(io.BytesIO(cached_tile), mimetype="image/png")
+            tile_mem_cache.set(cache_key, cached_tile, TILE_TTL)
+            return Response(cached_tile, mimetype="image/png", headers=headers)
     except Exception as e:
         logger.error(f"Error reading cache: {e}")
 
-    data = renderer.render_tile(model, param_key, hour_offset, z, x, y, level_arg, user_tof, step_type)
+    data = tile_renderer.render_tile(model, param_key, hour_offset, z, x, y, level_arg, user_tof, step_type, source_version)
     if data is None:
         return abort(404, "No tile data found")
 
-    try:
-        backend_cache.set(cache_key, data, 15 * 60 )
-    except Exception as e:
-        logger.error(f"Error writing cache: {e}")
+    tile_mem_cache.set(cache_key, data, TILE_TTL)
+    tile_cache_writer.submit(store_tiles, backend_cache, {cache_key: data})
 
-    response = send_file(io.BytesIO(data), mimetype="image/png");
-    # response.headers["Cache-Control"] = "public, max-age=900"
-    return response
+    return Response(data, mimetype="image/png", headers=headers)
 
 @app.route("/list_grib_parameters/<string:model>/<int:hour_offset>", methods=["GET"])
 def list_params(model, hour_offset):
@@ -0,0 +1,21 @@
+# gunicorn settings for the tile server: gunicorn -c gunicorn.conf.py main:app --workers N
+#
+# preload_app imports main.py once in the master and forks the workers from
+# it. Threads don't survive fork(), so anything that runs one must be
+# restarted in each worker:
+#   - InterpolatorCachingService's flusher and serializer pool restart from
+#     the os.register_at_fork hook in model_service.py;
+#   - numba's thread pool is launched by post_fork below (the master never
+#     launches it, but a worker must not inherit one if that ever changes).
+import os
+
+bind = "0.0.0.0:5001"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 4))
+preload_app = True
+
+
+def post_fork(server, worker):
+    from gfs_render.fast_interpolation import init_numba_threads
+
+    init_numba_threads()
@@ -11,24 +11,26 @@ A FastAPI server that:
      - /parameters
      - /prewarm/{model}/{hour_offset}
      - /point (POST) for point forecasts (optionally with a path hour_offset).
-  4) Handles missing values (using np.isclose) and dynamic lat_flip (via jScansPositively).
+  4) Handles missing values (a ±1 tolerance test fused into the render kernels) and dynamic lat_flip (via jScansPositively).
 
 Run with multiple worker processes (via Uvicorn) to help with CPU‐bound work.
 """
-import json
+import base64
+import orjson
 import os
-import io
 import logging
 from typing import  List, Optional, Union
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse, ORJSONResponse
 import asyncio
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 # Import your project modules (adjust paths as needed)
 from gfs_render import ModelService, RedisCacheBackend, TileRendering
+from gfs_render.fast_interpolation import init_numba_threads
+from gfs_render.tile_http import TILE_HEADERS, TILE_TTL, etag_matches, store_tiles, tile_etag, tile_mem_cache
 # from gfs_render.time_logger import TimeLogger
 
 
@@ -42,7 +44,13 @@ backend_cache = RedisCacheBackend()
 model_service = ModelService(backend_cache)
 tile_renderer = TileRendering(model_service)
 
-app = FastAPI(title="Global Norm Map Server", version="1.0")
+app = FastAPI(title="Global Norm Map Server", version="1.0", default_response_class=ORJSONResponse)
+
+@app.on_event("startup")
+def start_numba_threads():
+    # Runs in every worker, after gunicorn/uvicorn has forked or spawned it
+    init_numba_threads()
+
 # (Optional) Add CORS middleware if needed.
 app.add_middleware(
     CORSMiddleware,
@@ -65,6 +73,15 @@ class PointForecastRequest(BaseModel):
     level: Optional[int] = None
     typeOfLevel: Optional[str] = None
 
+class TileBatchRequest(BaseModel):
+    model: str
+    param_key: str
+    hour_offset: int = 0
+    tiles: List[List[int]]  # [[z, x, y], ...]
+    level: Optional[int] = None
+    typeOfLevel: Optional[str] = None
+    stepType: Optional[str] = None
+
 ###############################################################################
 # Routes
 ###############################################################################
@@ -83,6 +100,8 @@ def index():
 
 @app.get("/tiles/{model}/{param_key}/{hour_offset}/{z}/{x}/{y}.png")
 def serve_tile_route(
+    request: Request,
+    background_tasks: BackgroundTasks,
     model: str,
     param_key: str,
     hour_offset: int,
@@ -100,30 +119,90 @@ def serve_tile_route(
     if not tile_renderer.valid_zxy(z, x, y):
         raise HTTPException(status_code=404, detail="Invalid tile coordinates.")
 
-    cache_key = model_service.create_tile_cache_key(model, param_key, typeOfLevel, hour_offset, z, x, y, level, stepType)
+    source_version = model_service.grib_file_version(model, hour_offset)
+    cache_key = model_service.create_tile_cache_key(model, param_key, typeOfLevel, hour_offset, z, x, y, level, stepType, source_version)
+    headers = dict(TILE_HEADERS)
+    # No source file => no ETag: the tile is about to 404 or be rendered fresh
+    if source_version is not None:
+        headers["ETag"] = tile_etag(cache_key)
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+    use_mem_cache = "no-cache" not in request.headers.get("cache-control", "")
+    if use_mem_cache:
+        cached_tile = tile_mem_cache.get(cache_key)
+        if cached_tile:
+            return Response(content=cached_tile, media_type="image/png", headers=headers)
     try:
         cached_tile = backend_cache.get(cache_key)
         if cached_tile:
-            return StreamingResponse(io.BytesIO(cached_tile), media_type="image/png")
+            tile_mem_cache.set(cache_key, cached_tile, TILE_TTL)
+            return Response(content=cached_tile, media_type="image/png", headers=headers)
     except Exception as e:
         logger.error(f"Error reading cache: {e}")
 
-    data = tile_renderer.render_tile(model, param_key, hour_offset, z, x, y, level, typeOfLevel, stepType)
+    data = tile_renderer.render_tile(model, param_key, hour_offset, z, x, y, level, typeOfLevel, stepType, source_version)
     if data is None:
         raise HTTPException(status_code=404, detail="No tile data found")
+    tile_mem_cache.set(cache_key, data, TILE_TTL)
+    background_tasks.add_task(store_tiles, backend_cache, {cache_key: data})
+    # timer.log("I ENDED MY RENDER 2")
+    return Response(content=data, media_type="image/png", headers=headers)
+
+
+@app.post("/tiles_batch")
+def serve_tile_batch_route(req: TileBatchRequest, background_tasks: BackgroundTasks):
+    """
+    Several tiles of one layer in one call, e.g. a viewport:
+    {"model": "gfs", "param_key": "temperature", "hour_offset": 0, "tiles": [[3, 4, 2], [3, 5, 2]]}
+    Returns {"tiles": [{"z", "x", "y", "png": base64 PNG or null}, ...]} in request order.
+    Cached tiles come from the in-process cache / Redis; the rest are rendered
+    together, sharing one interpolator lookup.
+    """
+    if not model_service.valid_model(req.model):
+        raise HTTPException(status_code=404, detail="Unknown model.")
+    if any(len(t) != 3 or not tile_renderer.valid_zxy(*t) for t in req.tiles):
+        raise HTTPException(status_code=400, detail="Tiles must be valid [z, x, y] triples.")
+
+    source_version = model_service.grib_file_version(req.model, req.hour_offset)
+    keys = [
+        model_service.create_tile_cache_key(req.model, req.param_key, req.typeOfLevel, req.hour_offset, z, x, y, req.level,
+                                            req.stepType, source_version)
+        for z, x, y in req.tiles
+    ]
+    pngs = [tile_mem_cache.get(key) for key in keys]
+    unread = [i for i, png in enumerate(pngs) if not png]
     try:
-        backend_cache.set(cache_key, data, 15 * 60)
+        for i, cached_tile in zip(unread, backend_cache.mget([keys[i] for i in unread])):
+            if cached_tile:
+                pngs[i] = cached_tile
+                tile_mem_cache.set(keys[i], cached_tile, TILE_TTL)
     except Exception as e:
-        logger.error(f"Error writing cache: {e}")
-    # timer.log("I ENDED MY RENDER 2")
-    return StreamingResponse(io.BytesIO(data), media_type="image/png")
+        logger.error(f"Error reading cache: {e}")
+
+    missing = [i for i, png in enumerate(pngs) if not png]
+    if missing:
+        rendered = tile_renderer.render_tile_batch(
+            req.model, req.param_key, req.hour_offset, [tuple(req.tiles[i]) for i in missing],
+            req.level, req.typeOfLevel, req.stepType, source_version
+        )
+        fresh = {}
+        for i, data in zip(missing, rendered):
+            if data is not None:
+                pngs[i] = fresh[keys[i]] = data
+                tile_mem_cache.set(keys[i], data, TILE_TTL)
+        background_tasks.add_task(store_tiles, backend_cache, fresh)
+
+    return ORJSONResponse(content={"tiles": [
+        {"z": z, "x": x, "y": y, "png": base64.b64encode(png).decode("ascii") if png else None}
+        for (z, x, y), png in zip(req.tiles, pngs)
+    ]})
 
 
 @app.get("/list_parameters/{model}/{hour_offset}")
 def list_params(model: str, hour_offset: int):
     try:
         params = model_service.build_paramter_name_list(model, hour_offset)
-        return JSONResponse(content={"parameters": sorted(list(params.values()))})
+        return ORJSONResponse(content={"parameters": sorted(list(params.values()))})
     except Exception as e:
         logger.error(f"Error listing for {model},{hour_offset}: {e}")
         raise HTTPException(status_code=500, detail="GRIB reading error")
@@ -133,7 +212,7 @@ def list_params(model: str, hour_offset: int):
 def parameters_route():
     offset = 0
     results = model_service.parameter_definitions(offset)
-    return JSONResponse(content={"models": results})
+    return ORJSONResponse(content={"models": results})
 
 
 @app.post("/point", response_model=dict)
@@ -168,7 +247,7 @@ async def point_forecast_params_route(request: Request, hour_offset: int = 0):
         )
         if not values:
             raise HTTPException(status_code=404, detail="No forecast value found at this point.")
-        return JSONResponse(content=values)
+        return ORJSONResponse(content=values)
     except Exception as e:
         logger.error(f"Error in point forecast: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -227,13 +306,13 @@ async def forecast_streaming_route(request: Request):
         while not timeseries_future.done() or not progress_queue.empty():
             try:
                 msg = await asyncio.wait_for(progress_queue.get(), timeout=1)
-                yield f"{json.dumps(msg)}\n\n"
+                yield f"{orjson.dumps(msg, option=orjson.OPT_SERIALIZE_NUMPY).decode()}\n\n"
             except asyncio.TimeoutError:
                 # If no progress message, yield a keep-alive (optional)
                 yield "{}\n\n"
         # Once done, yield the final timeseries.
         timeseries = await timeseries_future
-        yield f"{json.dumps({'timeseries': timeseries})}\n\n"
+        yield f"{orjson.dumps({'timeseries': timeseries}, option=orjson.OPT_SERIALIZE_NUMPY).decode()}\n\n"
 
     return StreamingResponse(stream_forecast(), media_type="text/event-stream")
 
@@ -282,12 +361,14 @@ async def forecast_route(request: Request):
         step_type=step_type
     )
     if not timeseries:
-        return JSONResponse(content=[], status_code=200)
-    return JSONResponse(content=timeseries)
+        return ORJSONResponse(content=[], status_code=200)
+    return ORJSONResponse(content=timeseries)
 
 ###############################################################################
 # Main entry point
 ###############################################################################
 if __name__ == "__main__":
     # Run with multiple worker processes to distribute CPU-bound tasks.
+    # Deployments use gunicorn -c gunicorn.conf.py instead (see readme), so
+    # workers fork from one preloaded app rather than each importing it.
     uvicorn.run("main:app", host="0.0.0.0", port=5001, reload=False, workers=os.cpu_count() or 4)